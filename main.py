@@ -26,24 +26,1002 @@ See docstrings for each client class for API details.
 """
 
 import argparse
+import base64
+import cProfile
+import ctypes
+import ctypes.util
+import fnmatch
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import math
 import os
+import pstats
+import queue
 import re
+import select
+import socket
+import sqlite3
+import struct
 import sys
+import tempfile
+import threading
 import time
+import unicodedata
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Optional
-from urllib.parse import quote, urljoin
-from xmlrpc.client import ServerProxy
+from typing import Any, Callable, ContextManager, Iterator, Optional
+from urllib.parse import quote, urljoin, urlsplit
+from xmlrpc.client import (
+    Binary,
+    Fault,
+    ProtocolError,
+    SafeTransport,
+    ServerProxy,
+    Transport,
+)
+from xmlrpc.client import loads as xmlrpc_loads
 
 import requests
+from requests.structures import CaseInsensitiveDict
 
 
-def fetch_tracker_list() -> str:
+class _RawResponseTransport(Transport):
+    """
+    XML-RPC transport that keeps the raw body of the last response, so
+    it can be recorded or measured without re-marshalling the result
+    (xmlrpc dumps() rejects the <i8> values rTorrent returns for sizes
+    over 2 GiB).
+    """
+
+    last_response_body = b""
+    last_response_size = 0
+
+    def parse_response(self, response: Any) -> tuple:
+        body = response.read()
+        self.last_response_size = len(body)
+        if response.getheader("Content-Encoding", "") == "gzip":
+            body = gzip.decompress(body)
+        self.last_response_body = body
+        result, _ = xmlrpc_loads(
+            body,
+            use_datetime=self._use_datetime,
+            use_builtin_types=self._use_builtin_types,
+        )
+        return result
+
+
+class _RawResponseSafeTransport(_RawResponseTransport, SafeTransport):
+    """HTTPS variant of _RawResponseTransport."""
+
+
+def _raw_response_transport(url: str) -> _RawResponseTransport:
+    if url.startswith("https"):
+        return _RawResponseSafeTransport()
+    return _RawResponseTransport()
+
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode when no recorded exchange matches."""
+
+
+class Cassette:
+    """
+    Record/replay store for every HTTP and XML-RPC exchange.
+
+    In "record" mode, requests.Session.send (which carries apibay, TPB
+    and every JSON/REST backend call) and rTorrent's XML-RPC transport
+    are wrapped so each exchange is captured together with its latency.
+    In "replay" mode the same hooks serve the recorded responses
+    without touching the network, sleeping for the original latency
+    multiplied by `time_scale` (0 replays instantly); status polling
+    waits are scaled the same way.
+
+    Exchanges are matched on kind, method, URL (credentials stripped)
+    and a SHA-1 of the request body, in recorded order; request bodies
+    themselves are never stored, so passwords in login calls stay out
+    of the file. The cassette is gzip-compressed JSON lines.
+    """
+
+    # 2: XML-RPC responses are stored as raw base64 bodies
+    VERSION = 2
+
+    def __init__(self, path: str | Path, mode: str, time_scale: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.time_scale = time_scale
+        self.entries: list[dict] = []
+        self._pending: dict[tuple, deque] = {}
+        self._pending_by_url: dict[tuple, deque] = {}
+        self._lock = threading.Lock()
+        self._original_send: Optional[Callable] = None
+
+        if mode == "replay":
+            self._load()
+
+    @staticmethod
+    def _strip_credentials(url: str) -> str:
+        return re.sub(r"://[^/@]*@", "://", url)
+
+    @staticmethod
+    def _body_digest(body: Any) -> str:
+        if body is None:
+            body = b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if not isinstance(body, (bytes, bytearray)):
+            # Streamed/iterable bodies cannot be hashed without consuming
+            body = b"<stream>"
+        return hashlib.sha1(body).hexdigest()
+
+    def _key(self, kind: str, method: str, url: str, body: Any) -> tuple:
+        return (
+            kind,
+            method.upper(),
+            self._strip_credentials(url),
+            self._body_digest(body),
+        )
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            header = json.loads(cassette_file.readline())
+            if header.get("version") != self.VERSION:
+                raise RuntimeError(
+                    f"Unsupported cassette version: {header.get('version')}"
+                )
+            for line in cassette_file:
+                entry = json.loads(line)
+                self.entries.append(entry)
+                key = tuple(entry["key"])
+                self._pending.setdefault(key, deque()).append(entry)
+                self._pending_by_url.setdefault(key[:3], deque()).append(
+                    entry
+                )
+
+    def save(self) -> None:
+        """Write recorded exchanges to the cassette file."""
+        if self.mode != "record":
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as cassette_file:
+            cassette_file.write(json.dumps({"version": self.VERSION}) + "\n")
+            for entry in self.entries:
+                cassette_file.write(
+                    json.dumps(entry, separators=(",", ":")) + "\n"
+                )
+
+    def _record(
+        self, key: tuple, elapsed: float, response_fields: dict
+    ) -> None:
+        with self._lock:
+            self.entries.append(
+                {"key": list(key), "elapsed": round(elapsed, 6)}
+                | response_fields
+            )
+
+    def _next_entry(self, key: tuple) -> dict:
+        """Pop the next recorded exchange for key, waiting its latency."""
+        with self._lock:
+            queue = self._pending.get(key)
+            if not queue:
+                # Fall back to the next exchange on the same URL, e.g.
+                # when request ids differ because threads ran reordered
+                queue = self._pending_by_url.get(key[:3])
+            if not queue:
+                raise CassetteMiss(f"No recorded exchange for {key[:3]}")
+            entry = queue.popleft()
+            tuple_key = tuple(entry["key"])
+            for other in (
+                self._pending.get(tuple_key),
+                self._pending_by_url.get(tuple_key[:3]),
+            ):
+                if other and entry in other:
+                    other.remove(entry)
+
+        if self.time_scale > 0:
+            time.sleep(entry["elapsed"] * self.time_scale)
+        return entry
+
+    def _send(
+        self, session: requests.Session, request: Any, **kwargs: Any
+    ) -> requests.Response:
+        """Replacement for requests.Session.send."""
+        key = self._key("http", request.method, request.url, request.body)
+
+        if self.mode == "replay":
+            entry = self._next_entry(key)
+            response = requests.Response()
+            response.status_code = entry["status"]
+            response.reason = entry.get("reason", "")
+            response.headers = CaseInsensitiveDict(entry["headers"])
+            response._content = base64.b64decode(entry["body"])
+            response.encoding = entry.get("encoding")
+            response.url = request.url
+            response.request = request
+            response.elapsed = timedelta(seconds=entry["elapsed"])
+            return response
+
+        started_at = time.perf_counter()
+        response = self._original_send(session, request, **kwargs)
+        elapsed = time.perf_counter() - started_at
+        self._record(
+            key,
+            elapsed,
+            {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() != "set-cookie"
+                },
+                "encoding": response.encoding,
+                "body": base64.b64encode(response.content).decode("ascii"),
+            },
+        )
+        return response
+
+    def xmlrpc_transport(self, url: str) -> "_CassetteTransport":
+        """Transport for ServerProxy that records/replays via this file."""
+        return _CassetteTransport(
+            self, _raw_response_transport(url), self._strip_credentials(url)
+        )
+
+    def install(self) -> None:
+        """Route requests and rTorrent XML-RPC through this cassette."""
+        global _active_cassette
+        self._original_send = requests.Session.send
+        cassette = self
+
+        def send(
+            session: requests.Session, request: Any, **kwargs: Any
+        ) -> requests.Response:
+            return cassette._send(session, request, **kwargs)
+
+        requests.Session.send = send
+        _active_cassette = self
+
+    def uninstall(self) -> None:
+        """Restore normal network access and save a recording."""
+        global _active_cassette
+        if self._original_send is not None:
+            requests.Session.send = self._original_send
+            self._original_send = None
+        if _active_cassette is self:
+            _active_cassette = None
+        self.save()
+
+
+class _CassetteTransport:
+    """
+    xmlrpc.client transport wrapper used by Cassette. Responses are
+    stored as the raw bytes the server sent.
+    """
+
+    def __init__(
+        self, cassette: Cassette, inner: _RawResponseTransport, url: str
+    ):
+        self.cassette = cassette
+        self.inner = inner
+        self.url = url
+        self.last_response_body = b""
+        self.last_response_size = 0
+
+    def request(
+        self,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool = False,
+    ) -> tuple:
+        key = self.cassette._key("xmlrpc", "POST", self.url, request_body)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette._next_entry(key)
+            if "protocol_error" in entry:
+                raise ProtocolError(
+                    self.url, entry["protocol_error"], "replayed error", {}
+                )
+            body = base64.b64decode(entry["body"])
+            self.last_response_body = body
+            self.last_response_size = len(body)
+            result, _ = xmlrpc_loads(body)
+            return result
+
+        started_at = time.perf_counter()
+        try:
+            result = self.inner.request(host, handler, request_body, verbose)
+        except ProtocolError as error:
+            self.cassette._record(
+                key,
+                time.perf_counter() - started_at,
+                {"protocol_error": error.errcode},
+            )
+            raise
+        except Fault:
+            self._record_body(key, started_at)
+            raise
+
+        self._record_body(key, started_at)
+        return result
+
+    def _record_body(self, key: tuple, started_at: float) -> None:
+        self.last_response_body = self.inner.last_response_body
+        self.last_response_size = self.inner.last_response_size
+        self.cassette._record(
+            key,
+            time.perf_counter() - started_at,
+            {
+                "body": base64.b64encode(self.last_response_body).decode(
+                    "ascii"
+                )
+            },
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+_active_cassette: Optional[Cassette] = None
+
+
+def _poll_wait_seconds(seconds: float) -> float:
+    """
+    Scale a polling wait by --replay-speed while replaying a cassette,
+    so a replay is not paced by the recorded run's poll interval.
+    """
+    if _active_cassette is not None and _active_cassette.mode == "replay":
+        return seconds * _active_cassette.time_scale
+    return seconds
+
+
+def _xmlrpc_transport(url: str) -> Optional[Any]:
+    """Transport for a new ServerProxy (None means the default)."""
+    if _active_cassette is None and _active_profiler is None:
+        return None
+    if _active_cassette is not None:
+        transport = _active_cassette.xmlrpc_transport(url)
+    else:
+        transport = _raw_response_transport(url)
+    if _active_profiler is not None:
+        transport = _ProfilingTransport(_active_profiler, transport)
+    return transport
+
+
+class StageProfiler:
+    """
+    Per-stage timing and per-method RPC accounting for --profile.
+
+    profile_stage() records wall time (perf_counter) and CPU time of
+    the calling thread (thread_time, so overlapping startup stages are
+    attributed correctly). While installed, requests.Session.send and
+    rTorrent's XML-RPC transport are wrapped to count calls, bytes and
+    wall time per backend method: the JSON-RPC "method" for Transmission,
+    Deluge and aria2, the XML-RPC methodName for rTorrent, and the HTTP
+    method and path otherwise. Received XML-RPC bytes are the raw
+    response body as sent by the server. Nothing is wrapped unless a
+    profiler is installed.
+
+    With `code_profile`, cProfile also runs on the installing thread
+    and on every worker thread started through profile_thread() (the
+    startup stages and queue jobs); dump_code_profile() merges them.
+    """
+
+    def __init__(self, code_profile: bool = False) -> None:
+        # name -> [count, wall seconds, cpu seconds, max wall seconds]
+        self.stages: dict[str, list[float]] = {}
+        # label -> [calls, bytes sent, bytes received, wall seconds]
+        self.rpcs: dict[str, list[float]] = {}
+        self.code_profile = code_profile
+        self._code_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._original_send: Optional[Callable] = None
+
+    def _start_code_profile(self) -> Optional[cProfile.Profile]:
+        """Start cProfile on the calling thread if code profiling is on."""
+        if not self.code_profile:
+            return None
+        code_profile = cProfile.Profile()
+        try:
+            code_profile.enable()
+        except ValueError:
+            # Python 3.12+: a single profiler already covers all threads
+            return None
+        with self._lock:
+            self._code_profiles.append(code_profile)
+        return code_profile
+
+    def in_thread(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap function so the thread running it is code-profiled."""
+
+        def run(*args: Any, **kwargs: Any) -> Any:
+            code_profile = self._start_code_profile()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if code_profile:
+                    code_profile.disable()
+
+        return run
+
+    def dump_code_profile(self, path: str) -> None:
+        """Write the merged cProfile data of every profiled thread."""
+        with self._lock:
+            code_profiles = list(self._code_profiles)
+        if not code_profiles:
+            return
+        for code_profile in code_profiles:
+            code_profile.disable()
+        stats = pstats.Stats(code_profiles[0])
+        for code_profile in code_profiles[1:]:
+            stats.add(code_profile)
+        stats.dump_stats(path)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.thread_time() - cpu_started
+            with self._lock:
+                totals = self.stages.setdefault(name, [0, 0.0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += wall
+                totals[2] += cpu
+                totals[3] = max(totals[3], wall)
+
+    def record_rpc(
+        self, label: str, sent: int, received: int, seconds: float
+    ) -> None:
+        with self._lock:
+            totals = self.rpcs.setdefault(label, [0, 0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += sent
+            totals[2] += received
+            totals[3] += seconds
+
+    @staticmethod
+    def _http_label(request: Any) -> str:
+        body = request.body
+        if isinstance(body, bytes) and body.startswith(b"{"):
+            try:
+                method = json.loads(body).get("method")
+            except ValueError:
+                method = None
+            if method:
+                return str(method)
+        path = urlsplit(request.url).path or "/"
+        return f"{request.method} {path}"
+
+    def install(self) -> None:
+        """Start counting RPCs made through requests and XML-RPC."""
+        global _active_profiler
+        self._original_send = requests.Session.send
+        original_send = self._original_send
+        profiler = self
+
+        def send(
+            session: requests.Session, request: Any, **kwargs: Any
+        ) -> requests.Response:
+            started_at = time.perf_counter()
+            response = original_send(session, request, **kwargs)
+            body = request.body or b""
+            profiler.record_rpc(
+                profiler._http_label(request),
+                len(body),
+                len(response.content),
+                time.perf_counter() - started_at,
+            )
+            return response
+
+        requests.Session.send = send
+        _active_profiler = self
+        self._start_code_profile()
+
+    def uninstall(self) -> None:
+        global _active_profiler
+        if self._original_send is not None:
+            requests.Session.send = self._original_send
+            self._original_send = None
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def summary(self) -> str:
+        """Render stage and RPC tables."""
+        lines = [
+            "Profile summary",
+            f"  {'Stage':<28}{'Count':>7}{'Wall s':>10}{'CPU s':>10}"
+            f"{'Max s':>10}",
+        ]
+        for name, (count, wall, cpu, max_wall) in self.stages.items():
+            lines.append(
+                f"  {name:<28}{int(count):>7}{wall:>10.3f}{cpu:>10.3f}"
+                f"{max_wall:>10.3f}"
+            )
+        lines.append(
+            f"  {'RPC method':<28}{'Calls':>7}{'Sent B':>10}{'Recv B':>10}"
+            f"{'Wall s':>10}"
+        )
+        for label, (calls, sent, received, wall) in sorted(
+            self.rpcs.items(), key=lambda item: -item[1][3]
+        ):
+            lines.append(
+                f"  {label[:28]:<28}{int(calls):>7}{int(sent):>10}"
+                f"{int(received):>10}{wall:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+class _ProfilingTransport:
+    """
+    xmlrpc.client transport wrapper used by StageProfiler. `inner` is a
+    _RawResponseTransport or _CassetteTransport, which both expose the
+    size of the last raw response.
+    """
+
+    def __init__(
+        self,
+        profiler: StageProfiler,
+        inner: _RawResponseTransport | _CassetteTransport,
+    ):
+        self.profiler = profiler
+        self.inner = inner
+
+    def request(
+        self,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool = False,
+    ) -> tuple:
+        match = re.search(rb"<methodName>([^<]*)</methodName>", request_body)
+        label = match.group(1).decode() if match else "xmlrpc"
+        started_at = time.perf_counter()
+        try:
+            return self.inner.request(host, handler, request_body, verbose)
+        finally:
+            # Size of the raw response body as received; faults count too
+            self.profiler.record_rpc(
+                label,
+                len(request_body),
+                self.inner.last_response_size,
+                time.perf_counter() - started_at,
+            )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+_active_profiler: Optional[StageProfiler] = None
+
+
+def profile_stage(name: str) -> ContextManager[None]:
+    """Time a stage when --profile is active; a no-op otherwise."""
+    if _active_profiler is None:
+        return nullcontext()
+    return _active_profiler.stage(name)
+
+
+def profile_thread(function: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a function submitted to a worker thread so --profile-output
+    covers that thread too; returns it unchanged when not profiling.
+    """
+    if _active_profiler is None:
+        return function
+    return _active_profiler.in_thread(function)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate_per_second` up to `capacity`.
+    acquire() blocks until a token is available, so bursts of up to
+    `capacity` requests go out immediately and sustained traffic is
+    held to the refill rate.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int = 1):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self.rate_per_second
+        )
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """Block until one token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_seconds = (1.0 - self._tokens) / self.rate_per_second
+            time.sleep(wait_seconds)
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so no token is issued for `seconds`."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = (
+                min(self._tokens, 0.0) - seconds * self.rate_per_second
+            )
+
+
+class _CoalescedCall:
+    """A single in-flight or recently finished request shared by waiters."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished_at = 0.0
+        self.reusable_seconds = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedResult:
+    """A search result remembered by the SearchIndex."""
+
+    name: str
+    info_hash: str
+    seeders: int = 0
+    size_bytes: int = 0
+    added_at: int = 0
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a torrent name for loose matching: case-folded, with
+    punctuation and runs of whitespace collapsed to single spaces, so
+    "The.Wall.Street.Journal - 2026-10-19" and
+    "the wall street journal 2026 10 19" compare equal.
+    """
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return " ".join(re.findall(r"\w+", name))
+
+
+class SearchIndex:
+    """
+    Persistent local index of every apibay result seen, in SQLite.
+
+    Each search upserts its results (name, info hash, seeders, size,
+    added time), so later lookups by exact or normalized name, or by
+    added-date range, are answered from B-tree indexes without a
+    remote query. Free-text search uses an FTS5 table when SQLite was
+    built with it, falling back to LIKE otherwise.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            info_hash TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL,
+            seeders INTEGER NOT NULL DEFAULT 0,
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            added_at INTEGER NOT NULL DEFAULT 0,
+            seen_at REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS results_name ON results (name);
+        CREATE INDEX IF NOT EXISTS results_normalized_name
+            ON results (normalized_name);
+        CREATE INDEX IF NOT EXISTS results_added_at ON results (added_at);
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5 (
+            name, content='results', content_rowid='rowid'
+        );
+        CREATE TRIGGER IF NOT EXISTS results_fts_insert
+        AFTER INSERT ON results BEGIN
+            INSERT INTO results_fts (rowid, name)
+            VALUES (new.rowid, new.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS results_fts_delete
+        AFTER DELETE ON results BEGIN
+            INSERT INTO results_fts (results_fts, rowid, name)
+            VALUES ('delete', old.rowid, old.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS results_fts_update
+        AFTER UPDATE OF name ON results BEGIN
+            INSERT INTO results_fts (results_fts, rowid, name)
+            VALUES ('delete', old.rowid, old.name);
+            INSERT INTO results_fts (rowid, name)
+            VALUES (new.rowid, new.name);
+        END;
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(self.SCHEMA)
+            try:
+                self._connection.executescript(self.FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                self.has_fts = False
+
+    def add_results(self, results: list[dict]) -> int:
+        """
+        Upsert raw apibay results; returns how many were stored.
+        Seeders are refreshed for torrents already in the index.
+        """
+        now = time.time()
+        rows = []
+        for result in results:
+            name = result.get("name", "") or ""
+            info_hash = str(result.get("info_hash", "") or "").lower()
+            # apibay's placeholder for an empty result set has an
+            # all-zero info hash
+            if not name or not info_hash.strip("0"):
+                continue
+            rows.append(
+                (
+                    info_hash,
+                    name,
+                    normalize_name(name),
+                    int(result.get("seeders", 0) or 0),
+                    int(result.get("size", 0) or 0),
+                    int(result.get("added", 0) or 0),
+                    now,
+                )
+            )
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO results (info_hash, name, normalized_name, "
+                "seeders, size_bytes, added_at, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (info_hash) DO UPDATE SET "
+                "name = excluded.name, "
+                "normalized_name = excluded.normalized_name, "
+                "seeders = excluded.seeders, seen_at = excluded.seen_at",
+                rows,
+            )
+        return len(rows)
+
+    def _select(self, where: str, params: tuple) -> list[IndexedResult]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, info_hash, seeders, size_bytes, added_at "
+                f"FROM results WHERE {where}",
+                params,
+            ).fetchall()
+        return [IndexedResult(*row) for row in rows]
+
+    def find_exact(self, name: str) -> Optional[IndexedResult]:
+        """Return the best-seeded result with exactly this name."""
+        matches = self._select(
+            "name = ? ORDER BY seeders DESC LIMIT 1", (name,)
+        )
+        return matches[0] if matches else None
+
+    def find_normalized(self, name: str) -> list[IndexedResult]:
+        """Return results whose normalized name equals name's."""
+        return self._select(
+            "normalized_name = ? ORDER BY seeders DESC",
+            (normalize_name(name),),
+        )
+
+    def find_added_between(
+        self, start: float, end: float, query: str = ""
+    ) -> list[IndexedResult]:
+        """
+        Return results added to apibay in [start, end) (Unix times),
+        newest first, optionally restricted to names matching `query`.
+        """
+        where = "added_at >= ? AND added_at < ?"
+        params: tuple = (int(start), int(end))
+        if query:
+            match_where, match_params = self._match_clause(query)
+            where = f"{where} AND {match_where}"
+            params += match_params
+        return self._select(f"{where} ORDER BY added_at DESC", params)
+
+    def search(self, query: str, limit: int = 100) -> list[IndexedResult]:
+        """Return results whose name contains every word of `query`."""
+        where, params = self._match_clause(query)
+        return self._select(
+            f"{where} ORDER BY seeders DESC LIMIT ?", params + (limit,)
+        )
+
+    def _match_clause(self, query: str) -> tuple[str, tuple]:
+        words = normalize_name(query).split()
+        if not words:
+            return "1", ()
+        if self.has_fts:
+            fts_query = " ".join(f'"{word}"' for word in words)
+            return (
+                "rowid IN (SELECT rowid FROM results_fts "
+                "WHERE results_fts MATCH ?)",
+                (fts_query,),
+            )
+        return (
+            " AND ".join("normalized_name LIKE ?" for _ in words),
+            tuple(f"%{word}%" for word in words),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ApibaySearch:
+    """
+    Search front end for apibay with query coalescing and rate limiting.
+
+    Identical queries issued concurrently, or within
+    `coalesce_window_seconds` of each other, share a single q.php
+    request and every caller receives the same result list. The tracker
+    list is fetched once and reused for `tracker_ttl_seconds`. All
+    outbound requests pass through one TokenBucket; a 429 response
+    drains the bucket for the server's Retry-After before retrying.
+    With a `search_index`, every result list is also recorded there.
+    """
+
+    SEARCH_URL = "https://apibay.org/q.php"
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket | None = None,
+        coalesce_window_seconds: float = 5.0,
+        tracker_ttl_seconds: float = 3600.0,
+        search_index: SearchIndex | None = None,
+    ):
+        self.rate_limiter = rate_limiter or TokenBucket(1.0, capacity=5)
+        self.coalesce_window_seconds = coalesce_window_seconds
+        self.tracker_ttl_seconds = tracker_ttl_seconds
+        self.search_index = search_index
+        self._calls: dict[tuple, _CoalescedCall] = {}
+        self._lock = threading.Lock()
+
+    def http_get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Rate-limited GET, retrying after HTTP 429."""
+        for _ in range(self.MAX_RETRIES):
+            self.rate_limiter.acquire()
+            response = requests.get(url, **kwargs)
+            if response.status_code != 429:
+                return response
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            self.rate_limiter.penalize(retry_after)
+        return response
+
+    def _coalesce(
+        self, key: tuple, window_seconds: float, fetch: Callable[[], Any]
+    ) -> Any:
+        """
+        Run fetch() once for all callers sharing `key`. Results are
+        reused for `window_seconds`, empty results only for the
+        coalescing window, and errors are handed to current waiters but
+        never reused.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_fresh = call is not None and (
+                not call.done.is_set()
+                or time.monotonic() - call.finished_at
+                <= call.reusable_seconds
+            )
+            if not is_fresh:
+                call = _CoalescedCall()
+                self._calls[key] = call
+                is_leader = True
+            else:
+                is_leader = False
+
+        if is_leader:
+            try:
+                call.result = fetch()
+            except BaseException as e:
+                call.error = e
+            call.finished_at = time.monotonic()
+            if call.error is None:
+                call.reusable_seconds = (
+                    window_seconds
+                    if call.result
+                    else min(window_seconds, self.coalesce_window_seconds)
+                )
+            else:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+            call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def search(self, query: str, category: int = 601) -> list[dict]:
+        """
+        Return raw apibay results for a query.
+
+        Raises:
+            RuntimeError: If apibay returns a non-200 status
+        """
+
+        def fetch() -> list[dict]:
+            with profile_stage("search"):
+                response = self.http_get(
+                    self.SEARCH_URL,
+                    params={"q": query, "cat": category},
+                    timeout=10,
+                )
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f"Search failed with status {response.status_code}"
+                    )
+                results = response.json() or []
+            if self.search_index and isinstance(results, list):
+                self.search_index.add_results(results)
+            return results
+
+        return self._coalesce(
+            ("search", query, category), self.coalesce_window_seconds, fetch
+        )
+
+    def tracker_string(self) -> str:
+        """Return the cached tracker string, fetching it if stale."""
+
+        def fetch() -> str:
+            with profile_stage("tracker fetch+parse"):
+                return fetch_tracker_list(http_get=self.http_get)
+
+        return self._coalesce(("trackers",), self.tracker_ttl_seconds, fetch)
+
+
+_default_search_frontend = ApibaySearch()
+
+
+def fetch_tracker_list(
+    http_get: Callable[..., requests.Response] = requests.get,
+) -> str:
     """
     Fetch the current tracker list from ThePirateBay's main.js.
 
+    Args:
+        http_get: Function used to issue the GET request (lets the
+            search front end apply its rate limiter)
+
     Returns:
         URL-encoded tracker string suitable for appending to magnet
             links. Returns empty string if fetch fails (degrades
@@ -51,7 +1029,7 @@ def fetch_tracker_list() -> str:
     """
     try:
         print("[1/3] Fetching tracker list from ThePirateBay...")
-        response = requests.get(
+        response = http_get(
             "https://thepiratebay.org/static/main.js", timeout=10
         )
         script_content = (
@@ -94,7 +1072,11 @@ def fetch_tracker_list() -> str:
         return ""
 
 
-def search_magnet_link(query: str, exact_name: str | None = None) -> str:
+def search_magnet_link(
+    query: str,
+    exact_name: str | None = None,
+    search_frontend: ApibaySearch | None = None,
+) -> str:
     """
     Search ThePirateBay for a torrent and return its magnet link. The
     category is set to 601, for Ebooks
@@ -103,28 +1085,39 @@ def search_magnet_link(query: str, exact_name: str | None = None) -> str:
         query: Search query string
         exact_name: Optional exact name to match (returns first result
             if None)
+        search_frontend: Coalescing, rate-limited apibay front end
+            (defaults to a shared module-level instance). If it has a
+            search index, exact_name is looked up there first and
+            apibay is only queried on a miss.
 
     Returns:
         Magnet link with trackers, or empty string if not found
     """
+    search_frontend = search_frontend or _default_search_frontend
     try:
-        print(f"[2/3] Searching ThePirateBay for: {query}")
-        response = requests.get(
-            "https://apibay.org/q.php",
-            params={"q": query, "cat": 601},
-            timeout=10,
-        )
+        indexed = None
+        if search_frontend.search_index and exact_name:
+            indexed = search_frontend.search_index.find_exact(exact_name)
+        if indexed:
+            print(f"[2/3] Found in local search index: {indexed.name}")
+            tracker_string = search_frontend.tracker_string()
+            return (
+                f"magnet:?xt=urn:btih:{indexed.info_hash}"
+                f"&dn={quote(indexed.name)}{tracker_string}"
+            )
 
-        if response.status_code != 200:
-            print(f"  Error: Search failed with status {response.status_code}")
+        print(f"[2/3] Searching ThePirateBay for: {query}")
+        try:
+            results = search_frontend.search(query)
+        except RuntimeError as e:
+            print(f"  Error: {e}")
             return ""
 
-        results = response.json()
         if not results or (isinstance(results, list) and len(results) == 0):
             print(f"  No results found for: {query}")
             return ""
 
-        tracker_string = fetch_tracker_list()
+        tracker_string = search_frontend.tracker_string()
 
         for result in results:
             if result.get("name") == "No results returned":
@@ -184,7 +1177,7 @@ class TorrentHandle:
     Backend-specific handle for tracking a torrent.
 
     The ID format varies by backend:
-      - rTorrent:     40-char hex info_hash
+      - rTorrent:     40-char uppercase hex info_hash
       - qBittorrent:  40-char hex info_hash (lowercase)
       - Transmission: Numeric ID (as string)
       - Deluge:       40-char hex info_hash
@@ -194,7 +1187,7 @@ class TorrentHandle:
     handle_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TorrentStatus:
     """Current status of a torrent download."""
 
@@ -204,411 +1197,2619 @@ class TorrentStatus:
     is_complete: bool = False
     download_directory: str = ""
 
+    def download_path(self) -> Optional[Path]:
+        """Path to the downloaded file/directory, if known."""
+        if self.download_directory and self.name:
+            return Path(self.download_directory) / self.name
+        if self.download_directory:
+            return Path(self.download_directory)
+        return None
 
-class TorrentClient(ABC):
-    """
-    Abstract base class for torrent client backends. All
-    implementations must provide methods to add magnets and query
-    status.
-    """
-
-    def __init__(
-        self,
-        base_url: str,
-        username: str | None = None,
-        password: str | None = None,
-    ):
-        self.base_url = base_url
-        self.username = username
-        self.password = password
 
-    @abstractmethod
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
-        """
-        Add a magnet link to the client and start downloading.
+@dataclass(slots=True)
+class TransferStats:
+    """Backend-wide transfer statistics."""
 
-        Args:
-            magnet_link: Magnet URI string
+    download_rate_bytes_per_second: int = 0
+    active_torrents: Optional[int] = None
 
-        Returns:
-            TorrentHandle for polling status
 
-        Raises:
-            RuntimeError: If add fails
-        """
-        raise NotImplementedError
+@dataclass(slots=True)
+class FinishedTorrent:
+    """A torrent that has finished downloading and may be seeding."""
 
-    @abstractmethod
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        """
-        Query current status of a torrent.
+    handle: TorrentHandle
+    name: str = ""
+    ratio: float = 0.0
+    completed_at: float = 0.0  # Unix time, 0 if the backend omits it
 
-        Args:
-            handle: TorrentHandle from add_magnet_link()
 
-        Returns:
-            TorrentStatus with current download state
-        """
-        raise NotImplementedError
+@dataclass(slots=True)
+class TorrentFile:
+    """One file inside a torrent."""
 
-    def wait_until_complete(
-        self,
-        handle: TorrentHandle,
-        poll_interval_seconds: int = 10,
-        timeout_seconds: int = 3600,
-    ) -> Optional[Path]:
-        """
-        Poll torrent status until download completes or times out.
+    index: int
+    path: str
+    size_bytes: int = 0
 
-        Args:
-            handle: TorrentHandle to monitor
-            poll_interval_seconds: Time between status checks
-            timeout_seconds: Maximum time to wait
 
-        Returns:
-            Path to downloaded file/directory, or None if timeout/error
-        """
-        print("  Waiting for download to complete...")
-        elapsed_seconds = 0
+class FileSelection:
+    """
+    Which files of a torrent to download, as glob patterns such as
+    "*.pdf". Patterns match case-insensitively against the file name
+    and against the path inside the torrent.
+    """
 
-        while elapsed_seconds < timeout_seconds:
-            status = self.get_torrent_status(handle)
+    def __init__(self, patterns: list[str]):
+        self.patterns = [pattern.lower() for pattern in patterns]
 
-            if (
-                not status.name
-                and not status.total_size_bytes
-                and not status.download_directory
-            ):
-                print(
-                    "  Warning: Torrent not found (removed or backend error)"
-                )
-                return None
+    def matches(self, path: str) -> bool:
+        path = path.replace("\\", "/").lower()
+        file_name = path.rsplit("/", 1)[-1]
+        return any(
+            fnmatch.fnmatchcase(file_name, pattern)
+            or fnmatch.fnmatchcase(path, pattern)
+            for pattern in self.patterns
+        )
 
-            if status.is_complete:
-                print(f"\n  Download complete: {status.name}")
-                if status.download_directory and status.name:
-                    return Path(status.download_directory) / status.name
-                if status.download_directory:
-                    return Path(status.download_directory)
-                return None
+    def select(self, files: list[TorrentFile]) -> list[TorrentFile]:
+        """
+        Return the wanted files. If nothing matches, every file is
+        returned rather than skipping the whole torrent.
+        """
+        wanted = [
+            torrent_file
+            for torrent_file in files
+            if self.matches(torrent_file.path)
+        ]
+        return wanted or files
 
-            if status.total_size_bytes > 0:
-                progress_pct = (
-                    status.downloaded_bytes / status.total_size_bytes
-                ) * 100
-                downloaded_mb = status.downloaded_bytes / 1_000_000
-                total_mb = status.total_size_bytes / 1_000_000
-                print(
-                    f"  Progress: {progress_pct:.1f}% "
-                    f"({downloaded_mb:.1f}MB / {total_mb:.1f}MB)",
-                    end="\r",
-                )
 
-            time.sleep(poll_interval_seconds)
-            elapsed_seconds += poll_interval_seconds
+@dataclass(frozen=True, slots=True)
+class TransferSample:
+    """One (monotonic time, downloaded bytes) telemetry sample."""
 
-        print(f"\n  Error: Download timed out after {timeout_seconds} seconds")
-        return None
+    monotonic_time: float
+    downloaded_bytes: int
 
 
-class RTorrentClient(TorrentClient):
+class TransferTelemetry:
+    """
+    Transfer history for one torrent.
+
+    Samples live in a fixed-size ring buffer backed by two arrays, so
+    memory per handle stays constant no matter how long the torrent is
+    watched. Throughput is an exponentially weighted moving average of
+    the rate between consecutive samples (time constant
+    `smoothing_seconds`), the ETA is derived from it, and the torrent
+    counts as stalled when its byte count has not grown for
+    `stall_seconds`.
     """
-    rTorrent client via ruTorrent's XML-RPC endpoint.
 
-    API: XML-RPC over HTTP (basic auth optional)
-    Default URL: http://vpn:8080/plugins/httprpc/action.php
+    __slots__ = (
+        "_times",
+        "_bytes",
+        "_next_index",
+        "_count",
+        "smoothing_seconds",
+        "stall_seconds",
+        "total_size_bytes",
+        "_rate_bytes_per_second",
+        "_last_progress_at",
+    )
 
-    XML-RPC methods used:
-      - load.start("", magnet_link) - Add and start torrent
-      - d.name(hash) - Get torrent name
-      - d.size_bytes(hash) - Get total size
-      - d.completed_bytes(hash) - Get downloaded bytes
-      - d.complete(hash) - Check if complete (1=yes)
-      - d.directory(hash) - Get download directory
+    def __init__(
+        self,
+        capacity: int = 32,
+        smoothing_seconds: float = 30.0,
+        stall_seconds: float = 300.0,
+    ):
+        self._times = array("d", bytes(8 * capacity))
+        self._bytes = array("q", bytes(8 * capacity))
+        self._next_index = 0
+        self._count = 0
+        self.smoothing_seconds = smoothing_seconds
+        self.stall_seconds = stall_seconds
+        self.total_size_bytes = 0
+        self._rate_bytes_per_second = 0.0
+        self._last_progress_at = 0.0
+
+    def record(
+        self,
+        downloaded_bytes: int,
+        total_size_bytes: int = 0,
+        now: float | None = None,
+    ) -> None:
+        """Append a sample and update the smoothed rate."""
+        now = time.monotonic() if now is None else now
+        if total_size_bytes:
+            self.total_size_bytes = total_size_bytes
+
+        if self._count:
+            latest = self.latest()
+            elapsed = now - latest.monotonic_time
+            if elapsed <= 0:
+                return
+            delta_bytes = max(0, downloaded_bytes - latest.downloaded_bytes)
+            instant_rate = delta_bytes / elapsed
+            # Seed the average with the first measured rate
+            weight = (
+                1.0
+                if self._count == 1
+                else 1.0 - math.exp(-elapsed / self.smoothing_seconds)
+            )
+            self._rate_bytes_per_second += weight * (
+                instant_rate - self._rate_bytes_per_second
+            )
+            if delta_bytes:
+                self._last_progress_at = now
+        else:
+            self._last_progress_at = now
+
+        capacity = len(self._times)
+        self._times[self._next_index] = now
+        self._bytes[self._next_index] = downloaded_bytes
+        self._next_index = (self._next_index + 1) % capacity
+        self._count = min(self._count + 1, capacity)
+
+    def latest(self) -> TransferSample:
+        """Most recent sample (raises IndexError if there is none)."""
+        if not self._count:
+            raise IndexError("no samples recorded")
+        index = (self._next_index - 1) % len(self._times)
+        return TransferSample(self._times[index], self._bytes[index])
+
+    def samples(self) -> list[TransferSample]:
+        """Buffered samples, oldest first."""
+        capacity = len(self._times)
+        start = (self._next_index - self._count) % capacity
+        return [
+            TransferSample(
+                self._times[(start + i) % capacity],
+                self._bytes[(start + i) % capacity],
+            )
+            for i in range(self._count)
+        ]
+
+    @property
+    def rate_bytes_per_second(self) -> float:
+        """Smoothed download throughput."""
+        return self._rate_bytes_per_second
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds to completion, or None if unknown."""
+        if not self._count or not self.total_size_bytes:
+            return None
+        remaining = self.total_size_bytes - self.latest().downloaded_bytes
+        if remaining <= 0:
+            return 0.0
+        if self._rate_bytes_per_second <= 0:
+            return None
+        return remaining / self._rate_bytes_per_second
+
+    def is_stalled(self, now: float | None = None) -> bool:
+        """True if no bytes have arrived for `stall_seconds`."""
+        if not self._count:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - self._last_progress_at >= self.stall_seconds
+
+
+class TelemetryStore:
+    """
+    Per-handle TransferTelemetry, created on first sample and dropped
+    with discard() once a handle is no longer watched.
+
+    With `metrics_path` set, metrics() is written there as JSON at most
+    every `metrics_interval_seconds` (and whenever a handle is
+    discarded), for dashboards or a node_exporter textfile-style
+    collector.
     """
 
     def __init__(
         self,
-        base_url: str,
-        username: str | None = None,
-        password: str | None = None,
+        capacity: int = 32,
+        stall_seconds: float = 300.0,
+        metrics_path: str | Path | None = None,
+        metrics_interval_seconds: float = 10.0,
     ):
-        if username and password:
-            protocol, url_rest = base_url.split("://", 1)
-            base_url = f"{protocol}://{username}:{password}@{url_rest}"
+        self.capacity = capacity
+        self.stall_seconds = stall_seconds
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.metrics_interval_seconds = metrics_interval_seconds
+        self._telemetry: dict[TorrentHandle, TransferTelemetry] = {}
+        self._lock = threading.Lock()
+        self._metrics_written_at = -math.inf
+
+    def record(
+        self, handle: TorrentHandle, status: TorrentStatus
+    ) -> TransferTelemetry:
+        """Record a polled status and return the handle's telemetry."""
+        with self._lock:
+            telemetry = self._telemetry.get(handle)
+            if telemetry is None:
+                telemetry = TransferTelemetry(
+                    self.capacity, stall_seconds=self.stall_seconds
+                )
+                self._telemetry[handle] = telemetry
+        telemetry.record(status.downloaded_bytes, status.total_size_bytes)
+        self._write_metrics()
+        return telemetry
+
+    def get(self, handle: TorrentHandle) -> Optional[TransferTelemetry]:
+        return self._telemetry.get(handle)
+
+    def discard(self, handle: TorrentHandle) -> None:
+        with self._lock:
+            discarded = self._telemetry.pop(handle, None)
+        if discarded is not None:
+            self._write_metrics(force=True)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Current rate, ETA and stall flag for every handle."""
+        now = time.monotonic()
+        with self._lock:
+            items = list(self._telemetry.items())
+        return {
+            handle.handle_id: {
+                "rate_bytes_per_second": telemetry.rate_bytes_per_second,
+                "eta_seconds": telemetry.eta_seconds,
+                "stalled": telemetry.is_stalled(now),
+            }
+            for handle, telemetry in items
+        }
 
-        super().__init__(base_url, username, password)
-        self.rpc_server = ServerProxy(self.base_url)
-        print(f"[3/3] Connected to rTorrent at: {base_url}")
+    def _write_metrics(self, force: bool = False) -> None:
+        if self.metrics_path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if (
+                not force
+                and now - self._metrics_written_at
+                < self.metrics_interval_seconds
+            ):
+                return
+            self._metrics_written_at = now
+        try:
+            _write_atomic(
+                self.metrics_path, json.dumps(self.metrics()).encode()
+            )
+        except OSError as e:
+            print(f"\n  Warning: Failed to write metrics: {e}")
 
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
-        info_hash = extract_info_hash_from_magnet(magnet_link)
-        if not info_hash:
-            raise RuntimeError("Failed to extract info hash from magnet link")
 
+def format_transfer_telemetry(telemetry: TransferTelemetry) -> str:
+    """Render rate, ETA and stall state for a progress line."""
+    rate_mb = telemetry.rate_bytes_per_second / 1_000_000
+    text = f"{rate_mb:.2f}MB/s"
+    eta_seconds = telemetry.eta_seconds
+    if eta_seconds is not None:
+        minutes, seconds = divmod(int(eta_seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        text += f" ETA {hours:d}:{minutes:02d}:{seconds:02d}"
+    if telemetry.is_stalled():
+        text += " [stalled]"
+    return text
+
+
+class MetainfoCache:
+    """
+    On-disk cache of .torrent metainfo keyed by info hash.
+
+    Once a backend has resolved a magnet's metadata, the exported
+    .torrent is stored here so later adds of the same info hash (on
+    another backend, after cleanup, or after a failover) can upload it
+    directly instead of waiting on DHT/peers for metadata.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path_for(self, info_hash: str) -> Path:
+        return self.directory / f"{info_hash.lower()}.torrent"
+
+    def get(self, info_hash: str) -> Optional[bytes]:
+        """Return cached metainfo for info_hash, or None if absent."""
         try:
-            self.rpc_server.load.start("", magnet_link)
-            print("  Successfully added magnet to rTorrent")
-        except Exception as e:
-            print(f"  Error with primary method: {e}")
-            print("  Trying alternative method...")
-            self.rpc_server.load.start_verbose("", magnet_link)
-            print("  Successfully added magnet using alternative method")
+            metainfo = self._path_for(info_hash).read_bytes()
+        except OSError:
+            return None
+        # A bencoded .torrent is always a dictionary
+        return metainfo if metainfo.startswith(b"d") else None
 
-        return TorrentHandle(handle_id=info_hash)
+    def put(self, info_hash: str, metainfo: bytes) -> None:
+        """Store metainfo atomically (temp file, then rename)."""
+        _write_atomic(self._path_for(info_hash), metainfo)
 
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        hash_id = handle.handle_id
+
+def _write_atomic(path: Path, contents: bytes) -> None:
+    """
+    Write a file via a unique temp file in the same directory and a
+    rename, so readers (and concurrent writers) never see partial data.
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(contents)
+        os.replace(temp_name, path)
+    except BaseException:
         try:
-            name = self.rpc_server.d.name(hash_id)
-            total_size = int(self.rpc_server.d.size_bytes(hash_id))
-            downloaded = int(self.rpc_server.d.completed_bytes(hash_id))
-            is_complete = self.rpc_server.d.complete(hash_id) == 1
-            directory = str(self.rpc_server.d.directory(hash_id))
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
 
-            return TorrentStatus(
-                name=name,
-                total_size_bytes=total_size,
-                downloaded_bytes=downloaded,
-                is_complete=is_complete,
-                download_directory=directory,
+
+class InotifyCompletionSource:
+    """
+    Completion wake-ups from inotify events on a downloads directory.
+
+    Watches the directory (as mounted in this process, e.g.
+    ./clients/qbittorrent/downloads) for files being closed after
+    writing and for entries moved in from an incomplete directory.
+    wait() returns as soon as such an event concerns the expected
+    torrent, so the caller can run one confirming status RPC right away
+    and otherwise fall back to a slow heartbeat. The torrent may sit in
+    a subdirectory of the mount (rTorrent in the compose stack saves to
+    /downloads/rtorrent/<name>); see set_expected_name(). Linux only;
+    use create() to get None where inotify is unavailable.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise OSError(f"Downloads directory not found: {self.directory}")
+
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch descriptor -> path relative to the downloads directory
+        self._watches: dict[int, Path] = {}
+        # Torrent file/directory relative to the downloads directory
+        self.expected_path: Optional[Path] = None
+        if not self._add_watch(self.directory):
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(
+                error, f"inotify_add_watch failed: {os.strerror(error)}"
             )
-        except Exception as e:
-            print(f"\n  Error querying rTorrent: {e}")
-            return TorrentStatus()
 
+    @classmethod
+    def create(
+        cls, directory: str | Path
+    ) -> Optional["InotifyCompletionSource"]:
+        """Return a completion source, or None to fall back to polling."""
+        try:
+            return cls(directory)
+        except (OSError, TypeError) as e:
+            print(f"  Warning: inotify unavailable ({e}), polling instead")
+            return None
 
-class QBittorrentClient(TorrentClient):
-    """
-    qBittorrent client via Web API (cookie-based auth).
+    def _add_watch(self, path: Path) -> bool:
+        """
+        Watch one directory; False if inotify refused (e.g. ENOSPC when
+        max_user_watches is exhausted, or EACCES).
+        """
+        watch_descriptor = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), self.WATCH_MASK
+        )
+        if watch_descriptor < 0:
+            return False
+        self._watches[watch_descriptor] = path.relative_to(self.directory)
+        return True
+
+    def _add_watch_tree(self, path: Path) -> None:
+        self._add_watch(path)
+        for root, dir_names, _ in os.walk(path):
+            for dir_name in dir_names:
+                self._add_watch(Path(root) / dir_name)
+
+    def set_expected_name(
+        self, name: str, download_directory: str = ""
+    ) -> None:
+        """
+        Only wake for events on this torrent's file or directory.
 
-    API: RESTful HTTP API with cookie authentication
-    Default URL: http://localhost:8080
-    Requires: WebUI enabled in qBittorrent settings
+        Args:
+            name: Torrent name
+            download_directory: Directory the backend saves it in, as
+                the backend sees it
+        """
+        if not name:
+            return
+        expected_path = self._local_path(Path(download_directory) / name)
+        if expected_path == self.expected_path:
+            return
+        self.expected_path = expected_path
+        parent = self.directory / expected_path.parent
+        if parent != self.directory and parent.is_dir():
+            self._add_watch(parent)
+        if (self.directory / expected_path).is_dir():
+            self._add_watch_tree(self.directory / expected_path)
+
+    def _local_path(self, backend_path: Path) -> Path:
+        """
+        Map a path as the backend sees it to one relative to the
+        downloads directory: the longest tail of it whose parent
+        directory exists here.
+        """
+        parts = (
+            backend_path.parts[1:]
+            if backend_path.is_absolute()
+            else backend_path.parts
+        )
+        for start in range(len(parts) - 1):
+            if (self.directory / Path(*parts[start:-1])).is_dir():
+                return Path(*parts[start:])
+        return Path(parts[-1])
+
+    def _is_relevant(self, relative_path: Path) -> bool:
+        if self.expected_path is None:
+            return True
+        expected_parts = self.expected_path.parts
+        return relative_path.parts[: len(expected_parts)] == expected_parts
+
+    def wait(self, timeout_seconds: float) -> bool:
+        """
+        Block until a relevant event arrives or the timeout expires.
 
-    Endpoints used:
-      - POST /api/v2/auth/login - Authenticate and get cookie
-      - POST /api/v2/torrents/add - Add magnet link
-      - GET /api/v2/torrents/info?hashes=... - Query torrent status
+        Returns:
+            True if a relevant event fired, False on timeout
+        """
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._drain_events():
+                return True
+
+    def _drain_events(self) -> bool:
+        """Read all queued events; True if any were relevant."""
+        relevant = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+
+            offset = 0
+            while offset < len(buffer):
+                watch_descriptor, mask, _, name_length = (
+                    self._EVENT_HEADER.unpack_from(buffer, offset)
+                )
+                offset += self._EVENT_HEADER.size
+                name = os.fsdecode(
+                    buffer[offset : offset + name_length].rstrip(b"\0")
+                )
+                offset += name_length
 
-    Docs: https://github.com/qbittorrent/qBittorrent/wiki/WebUI-API
+                parent = self._watches.get(watch_descriptor)
+                if parent is None or not name:
+                    continue
+                relative_path = parent / name
+
+                if not self._is_relevant(relative_path):
+                    continue
+                if mask & self.IN_ISDIR:
+                    # Multi-file torrents write inside (or move in) a
+                    # directory named after the torrent
+                    self._add_watch_tree(self.directory / relative_path)
+                if mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    relevant = True
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class DelugeCompletionWaiter:
+    """
+    Per-torrent view of a DelugeEventStream, usable as the
+    completion_source of TorrentClient.wait_until_complete().
     """
 
     def __init__(
         self,
-        base_url: str,
-        username: str | None = None,
-        password: str | None = None,
+        stream: "DelugeEventStream",
+        torrent_id: str,
+        wake: threading.Event,
     ):
-        super().__init__(base_url.rstrip("/"), username, password)
-        self.session = requests.Session()
-        self._authenticate()
-        print(f"[3/3] Connected to qBittorrent at: {self.base_url}")
+        self.stream = stream
+        self.torrent_id = torrent_id
+        self._wake = wake
 
-    def _build_api_url(self, endpoint: str) -> str:
-        """Build full API URL from endpoint path."""
-        return urljoin(self.base_url + "/", endpoint.lstrip("/"))
+    def set_expected_name(
+        self, name: str, download_directory: str = ""
+    ) -> None:
+        """Events carry the torrent id, so the name is not needed."""
 
-    def _authenticate(self) -> None:
-        """Authenticate with qBittorrent and obtain session cookie."""
-        if not self.username or not self.password:
-            raise RuntimeError(
-                "qBittorrent requires TORRENT_USER and TORRENT_PASSWORD"
-            )
+    def wait(self, timeout_seconds: float) -> bool:
+        """
+        Block until an event concerns this torrent or the timeout
+        expires.
 
-        response = self.session.post(
-            self._build_api_url("/api/v2/auth/login"),
-            data={"username": self.username, "password": self.password},
-            timeout=10,
-        )
+        Returns:
+            True if an event fired, False on timeout
+        """
+        fired = self._wake.wait(timeout_seconds)
+        self._wake.clear()
+        return fired
 
-        if response.status_code != 200 or "Ok." not in response.text:
-            raise RuntimeError(
-                f"qBittorrent login failed: HTTP {response.status_code} "
-                f"response={response.text!r}"
-            )
+    def close(self) -> None:
+        self.stream.unwatch(self.torrent_id)
 
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
-        info_hash = extract_info_hash_from_magnet(magnet_link)
-        if not info_hash:
-            raise RuntimeError("Failed to extract info hash from magnet link")
 
-        response = self.session.post(
-            self._build_api_url("/api/v2/torrents/add"),
-            data={"urls": magnet_link},
-            timeout=20,
-        )
+class DelugeEventStream:
+    """
+    Completion wake-ups from the Deluge Web UI event queue.
+
+    One background thread registers for torrent events with
+    web.register_event_listener and long-polls web.get_events, which
+    Deluge answers as soon as an event is queued (or with None after
+    about five idle minutes). Each event wakes the waiter of the
+    torrent it names, so any number of waits share one connection. If
+    the stream is lost (web UI restarted, session expired), the thread
+    checks every watched torrent with one core.get_torrents_status
+    batch per `fallback_interval_seconds` and re-registers until
+    events flow again.
+    """
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"qBittorrent add failed: HTTP {response.status_code} "
-                f"response={response.text!r}"
-            )
+    EVENTS = (
+        "TorrentFinishedEvent",
+        "TorrentAddedEvent",
+        "TorrentRemovedEvent",
+    )
+    # Longer than Deluge's own ~300 s idle cutoff for web.get_events
+    LONG_POLL_TIMEOUT_SECONDS = 330
 
-        print("  Successfully added magnet to qBittorrent")
-        return TorrentHandle(handle_id=info_hash.lower())
+    def __init__(
+        self, client: "DelugeClient", fallback_interval_seconds: float = 10
+    ):
+        self.client = client
+        self.fallback_interval_seconds = fallback_interval_seconds
+        self.is_listening = False
+        # The stream logs in on its own web session, so its listener,
+        # long poll and request ids never touch the client's session
+        # from the background thread
+        self._session = requests.Session()
+        self._request_id = 1
+        self._waiters: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warned = False
+
+    def watch(self, handle: TorrentHandle) -> DelugeCompletionWaiter:
+        """Return a waiter for a torrent, starting the stream if needed."""
+        torrent_id = handle.handle_id.lower()
+        with self._lock:
+            wake = self._waiters.setdefault(torrent_id, threading.Event())
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="deluge-events", daemon=True
+                )
+                self._thread.start()
+        return DelugeCompletionWaiter(self, torrent_id, wake)
+
+    def unwatch(self, torrent_id: str) -> None:
+        with self._lock:
+            self._waiters.pop(torrent_id, None)
+
+    def _wake(self, torrent_id: str) -> None:
+        with self._lock:
+            wake = self._waiters.get(torrent_id.lower())
+        if wake:
+            wake.set()
+
+    def _warn(self, message: str) -> None:
+        if not self._warned:
+            self._warned = True
+            print(
+                f"\n  Warning: {message}; checking status every "
+                f"{self.fallback_interval_seconds:g}s until it recovers"
+            )
 
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        response = self.session.get(
-            self._build_api_url("/api/v2/torrents/info"),
-            params={"hashes": handle.handle_id},
-            timeout=10,
+    def _execute_rpc(
+        self, method: str, params: list, timeout: float = 15
+    ) -> Any:
+        """Execute a Deluge JSON-RPC call on the stream's session."""
+        request_id = self._request_id
+        self._request_id += 1
+        return self.client._post_rpc(
+            self._session, request_id, method, params, timeout
         )
 
-        if response.status_code != 200:
-            return TorrentStatus()
+    def _register(self) -> bool:
+        """(Re)register the event listeners; False if Deluge refused."""
+        try:
+            self.client._authenticate(self._execute_rpc)
+            for event_name in self.EVENTS:
+                self._execute_rpc("web.register_event_listener", [event_name])
+        except Exception as e:
+            self._warn(f"Deluge events unavailable ({e})")
+            return False
+
+        self.is_listening = True
+        # Catch completions that happened before the listener existed
+        self._check_watched()
+        return True
+
+    def _check_watched(self) -> None:
+        """Wake waiters whose torrent finished or disappeared."""
+        with self._lock:
+            torrent_ids = list(self._waiters)
+        if not torrent_ids:
+            return
+        try:
+            statuses_by_id = (
+                self._execute_rpc(
+                    "core.get_torrents_status",
+                    [{"id": torrent_ids}, ["is_finished"]],
+                )
+                or {}
+            )
+        except Exception:
+            return
+        for torrent_id in torrent_ids:
+            status = statuses_by_id.get(torrent_id)
+            if not status or status.get("is_finished"):
+                self._wake(torrent_id)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self.is_listening and not self._register():
+                self._check_watched()
+                self._stopped.wait(self.fallback_interval_seconds)
+                continue
 
-        torrents = response.json()
-        if not torrents:
-            return TorrentStatus()
+            try:
+                events = self._execute_rpc(
+                    "web.get_events",
+                    [],
+                    timeout=self.LONG_POLL_TIMEOUT_SECONDS,
+                )
+            except Exception as e:
+                if self._stopped.is_set():
+                    return
+                self.is_listening = False
+                self._warn(f"Deluge event stream lost ({e})")
+                self._check_watched()
+                self._stopped.wait(self.fallback_interval_seconds)
+                continue
 
-        torrent_info = torrents[0]
-        name = torrent_info.get("name", "") or ""
-        total_size = int(torrent_info.get("size", 0) or 0)
-        downloaded = int(torrent_info.get("completed", 0) or 0)
-        progress = float(torrent_info.get("progress", 0.0) or 0.0)
-        is_complete = progress >= 1.0
-        directory = torrent_info.get("save_path", "") or ""
+            self._warned = False
+            # Events arrive as [event_name, [torrent_id, ...]] pairs
+            for _, event_args in events or []:
+                if event_args:
+                    self._wake(str(event_args[0]))
 
-        return TorrentStatus(
-            name=name,
-            total_size_bytes=total_size,
-            downloaded_bytes=downloaded,
-            is_complete=is_complete,
-            download_directory=directory,
-        )
+    def close(self) -> None:
+        self._stopped.set()
+        self._session.close()
 
 
-class TransmissionClient(TorrentClient):
+class TorrentClient(ABC):
     """
-    Transmission client via JSON-RPC.
-
-    API: JSON-RPC over HTTP with session ID handshake
-    Default URL: http://localhost:9091/transmission/rpc
-    Requires: RPC enabled in Transmission settings
-
-    Special handling: Transmission requires X-Transmission-Session-Id
-    header. First request returns 409 with correct session ID, then
-    retry.
-
-    RPC methods used:
-      - torrent-add - Add magnet link
-      - torrent-get - Query torrent status
-
-    Docs: https://github.com/transmission/transmission/blob/main/docs/rpc-spec.md
+    Abstract base class for torrent client backends. All
+    implementations must provide methods to add magnets and query
+    status.
     """
 
+    # Backends that load torrents from a watch directory override
+    # watch_dir_file() and set this
+    supports_watch_dir = False
+    # Cleared by backends whose list_finished_torrents() cannot fill in
+    # FinishedTorrent.completed_at
+    reports_completion_time = True
+
     def __init__(
         self,
         base_url: str,
         username: str | None = None,
         password: str | None = None,
     ):
-        super().__init__(base_url, username, password)
-        self.session = requests.Session()
-        self.session_id: Optional[str] = None
-
-        if self.username and self.password:
-            self.session.auth = (self.username, self.password)
-
-        print(f"[3/3] Connected to Transmission RPC at: {self.base_url}")
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.metainfo_cache: Optional[MetainfoCache] = None
+        self.file_selection: Optional[FileSelection] = None
+        self.telemetry = TelemetryStore()
+        self._info_hashes: dict[TorrentHandle, str] = {}
+        self._thread_local = threading.local()
+        # Shared by every thread's session, see `session`
+        self._cookies = requests.cookies.RequestsCookieJar()
+        self.session_auth: Optional[tuple[str, str]] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        This thread's requests.Session for HTTP backends. Queue workers
+        and watch_many() call the backend from several threads, so each
+        gets its own session; all of them share one cookie jar, so a
+        login on any thread authenticates the others.
+        """
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.cookies = self._cookies
+            session.auth = self.session_auth
+            self._thread_local.session = session
+        return session
 
-    def _execute_rpc(self, method: str, arguments: dict) -> dict:
+    @abstractmethod
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
         """
-        Execute a Transmission RPC call with session ID handshake.
+        Add a magnet link to the client and start downloading.
 
         Args:
-            method: RPC method name
-            arguments: Method arguments dict
+            magnet_link: Magnet URI string
 
         Returns:
-            Response data dict
+            TorrentHandle for polling status
 
         Raises:
-            RuntimeError: If RPC call fails
+            RuntimeError: If add fails
         """
-        payload = {"method": method, "arguments": arguments}
+        raise NotImplementedError
 
-        headers = {}
-        if self.session_id:
-            headers["X-Transmission-Session-Id"] = self.session_id
+    @abstractmethod
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        """
+        Query current status of a torrent.
 
-        response = self.session.post(
-            self.base_url, json=payload, headers=headers, timeout=15
-        )
+        Args:
+            handle: TorrentHandle from add_magnet_link()
 
-        if response.status_code == 409:
-            new_session_id = response.headers.get("X-Transmission-Session-Id")
-            if not new_session_id:
-                raise RuntimeError(
-                    "Transmission returned 409 but no session ID header"
-                )
-            self.session_id = new_session_id
-            headers["X-Transmission-Session-Id"] = self.session_id
+        Returns:
+            TorrentStatus with current download state
+        """
+        raise NotImplementedError
 
-            response = self.session.post(
-                self.base_url, json=payload, headers=headers, timeout=15
-            )
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        """
+        Query the status of several torrents. Backends override this
+        with a single batched RPC; the default queries one at a time.
+
+        Args:
+            handles: TorrentHandles from add_magnet_link()
+
+        Returns:
+            Mapping of each handle to its TorrentStatus (an empty
+            TorrentStatus if the torrent was not found)
+        """
+        return {handle: self.get_torrent_status(handle) for handle in handles}
+
+    def watch_dir_file(self, magnet_link: str) -> tuple[str, bytes]:
+        """
+        Build the file a watch directory expects for a magnet link.
+        Only called when `supports_watch_dir` is set.
+
+        Args:
+            magnet_link: Magnet URI string
+
+        Returns:
+            (file suffix, file contents)
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support watch directories"
+        )
+
+    @abstractmethod
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        """
+        Map info hashes of torrents added out of band (e.g. through a
+        watch directory, or by a worker that died before recording the
+        handle) to handles.
+
+        Args:
+            info_hashes: Lowercase hex info hashes
+
+        Returns:
+            Mapping of each info hash the backend already knows to its
+            TorrentHandle; unknown hashes are omitted
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        """
+        List the files of a torrent whose metadata has resolved.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        """
+        Skip every file of a torrent that is not in `wanted`.
+
+        Args:
+            handle: TorrentHandle from add_magnet_link()
+            files: All files, as returned by get_files()
+            wanted: Files to keep downloading
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        """
+        List every torrent on the backend that has finished downloading.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_torrents(self, handles: list[TorrentHandle]) -> None:
+        """
+        Remove torrents from the backend in one batch, keeping their
+        downloaded data on disk.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_transfer_stats(self) -> TransferStats:
+        """
+        Query backend-wide transfer statistics.
+
+        Returns:
+            TransferStats with the global download rate and, where the
+            backend reports it, the number of active torrents
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        """
+        Add a .torrent file (raw bencoded metainfo) and start downloading.
+
+        Args:
+            metainfo: Contents of the .torrent file
+            info_hash: Info hash of the torrent
+
+        Returns:
+            TorrentHandle for polling status
+
+        Raises:
+            RuntimeError: If add fails
+        """
+        raise NotImplementedError
+
+    def export_metainfo(self, handle: TorrentHandle) -> Optional[bytes]:
+        """
+        Export the .torrent metainfo of a torrent whose metadata has
+        resolved.
+
+        Args:
+            handle: TorrentHandle from add_magnet_link()
+
+        Returns:
+            Raw .torrent bytes, or None if the backend cannot export
+        """
+        return None
+
+    def add_torrent(self, magnet_link: str) -> TorrentHandle:
+        """
+        Add a torrent, uploading cached metainfo instead of the magnet
+        link when the metainfo cache already holds its info hash.
+
+        Args:
+            magnet_link: Magnet URI string
+
+        Returns:
+            TorrentHandle for polling status
+        """
+        info_hash = extract_info_hash_from_magnet(magnet_link)
+        handle: Optional[TorrentHandle] = None
+
+        if info_hash and self.metainfo_cache:
+            metainfo = self.metainfo_cache.get(info_hash)
+            if metainfo:
+                try:
+                    handle = self.add_torrent_file(metainfo, info_hash)
+                except Exception as e:
+                    print(f"  Warning: Cached .torrent add failed: {e}")
+
+        if handle is None:
+            handle = self.add_magnet_link(magnet_link)
+
+        if info_hash:
+            self._info_hashes[handle] = info_hash.lower()
+        return handle
+
+    def _on_metadata_resolved(self, handle: TorrentHandle) -> None:
+        """
+        Export/cache metainfo once the backend has resolved the
+        torrent's metadata.
+        """
+        info_hash = self._info_hashes.get(handle)
+        if not info_hash or not self.metainfo_cache:
+            return
+        if self.metainfo_cache.get(info_hash):
+            return
+
+        try:
+            metainfo = self.export_metainfo(handle)
+        except Exception as e:
+            print(f"\n  Warning: Failed to export metainfo: {e}")
+            return
+
+        if metainfo:
+            self.metainfo_cache.put(info_hash, metainfo)
+
+    def _apply_file_selection(self, handle: TorrentHandle) -> bool:
+        """
+        Mark files outside the file selection as skipped.
+
+        Returns:
+            False if the selection should be retried on a later poll:
+            the backend listed no files yet (metadata still loading)
+            or applying it failed
+        """
+        if not self.file_selection:
+            return True
+        try:
+            files = self.get_files(handle)
+            if not files:
+                return False
+            wanted = self.file_selection.select(files)
+            if len(wanted) == len(files):
+                return True
+            self.set_files_wanted(handle, files, wanted)
+        except Exception as e:
+            print(f"\n  Warning: Failed to apply file selection: {e}")
+            return False
+
+        wanted_mb = sum(f.size_bytes for f in wanted) / 1_000_000
+        print(
+            f"\n  Selected {len(wanted)} of {len(files)} files "
+            f"({wanted_mb:.1f}MB)"
+        )
+        return True
+
+    def wait_until_complete(
+        self,
+        handle: TorrentHandle,
+        poll_interval_seconds: int = 10,
+        timeout_seconds: int = 3600,
+        completion_source: (
+            InotifyCompletionSource | DelugeCompletionWaiter | None
+        ) = None,
+        heartbeat_seconds: int = 120,
+    ) -> Optional[Path]:
+        """
+        Poll torrent status until download completes or times out.
+
+        Args:
+            handle: TorrentHandle to monitor
+            poll_interval_seconds: Time between status checks
+            timeout_seconds: Maximum time to wait
+            completion_source: Optional filesystem or backend event
+                source; when given, status is checked right after each
+                relevant event and otherwise every heartbeat_seconds
+            heartbeat_seconds: Status check interval between events
+
+        Returns:
+            Path to downloaded file/directory, or None if timeout/error
+        """
+        print("  Waiting for download to complete...")
+        deadline = time.monotonic() + timeout_seconds
+        metadata_resolved = False
+        files_selected = False
+        # Whether the last completion_source.wait() saw an event
+        event_fired: Optional[bool] = None
+
+        try:
+            while time.monotonic() < deadline:
+                with profile_stage("poll"):
+                    status = self.get_torrent_status(handle)
+
+                if (
+                    not status.name
+                    and not status.total_size_bytes
+                    and not status.download_directory
+                ):
+                    print(
+                        "  Warning: Torrent not found "
+                        "(removed or backend error)"
+                    )
+                    return None
+
+                if status.total_size_bytes > 0:
+                    if not metadata_resolved:
+                        metadata_resolved = True
+                        self._on_metadata_resolved(handle)
+                    if not files_selected:
+                        files_selected = self._apply_file_selection(handle)
+
+                if status.is_complete:
+                    print(f"\n  Download complete: {status.name}")
+                    if (
+                        isinstance(completion_source, InotifyCompletionSource)
+                        and event_fired is False
+                    ):
+                        print(
+                            "  Warning: No inotify event fired for "
+                            f"{completion_source.expected_path}; completion "
+                            "was only seen by the status heartbeat. Check "
+                            "that the downloads directory is the backend's "
+                            "download folder"
+                        )
+                    return status.download_path()
+
+                telemetry = self.telemetry.record(handle, status)
+                if status.total_size_bytes > 0:
+                    progress_pct = (
+                        status.downloaded_bytes / status.total_size_bytes
+                    ) * 100
+                    downloaded_mb = status.downloaded_bytes / 1_000_000
+                    total_mb = status.total_size_bytes / 1_000_000
+                    print(
+                        f"  Progress: {progress_pct:.1f}% "
+                        f"({downloaded_mb:.1f}MB / {total_mb:.1f}MB) "
+                        f"{format_transfer_telemetry(telemetry)}    ",
+                        end="\r",
+                    )
+
+                if completion_source:
+                    completion_source.set_expected_name(
+                        status.name, status.download_directory
+                    )
+                    event_fired = completion_source.wait(
+                        _poll_wait_seconds(
+                            min(
+                                heartbeat_seconds,
+                                max(0, deadline - time.monotonic()),
+                            )
+                        )
+                    )
+                else:
+                    time.sleep(_poll_wait_seconds(poll_interval_seconds))
+
+            print(
+                f"\n  Error: Download timed out after {timeout_seconds} "
+                "seconds"
+            )
+            return None
+        finally:
+            # Keep telemetry only for torrents still being watched
+            self.telemetry.discard(handle)
+
+
+class RTorrentClient(TorrentClient):
+    """
+    rTorrent client via ruTorrent's XML-RPC endpoint.
+
+    API: XML-RPC over HTTP (basic auth optional)
+    Default URL: http://vpn:8080/plugins/httprpc/action.php
+
+    XML-RPC methods used:
+      - load.start("", magnet_link) - Add and start torrent
+      - load.raw_start("", metainfo) - Add and start a .torrent file
+      - session.path() - Session directory (for .torrent export)
+      - d.name(hash) - Get torrent name
+      - d.size_bytes(hash) - Get total size
+      - d.completed_bytes(hash) - Get downloaded bytes
+      - d.complete(hash) - Check if complete (1=yes)
+      - d.directory(hash) - Get download directory
+      - d.selected_size_bytes(hash) - Size of wanted files
+      - d.wanted_chunks(hash) - Chunks still needed for wanted files
+      - f.multicall(hash, "", ...) - List files
+      - f.priority.set("hash:fN", 0) + d.update_priorities - Skip files
+      - system.multicall - Batch the d.* calls for many torrents
+      - throttle.global_down.rate() - Global download rate
+      - download_list() - Info hashes of all loaded torrents
+      - d.multicall2("", "complete", ...) - List finished torrents
+      - d.erase(hash) - Remove torrent (keeps data)
+
+    Watch directory: rTorrent's watch_directory schedule loads
+    "*.torrent"; magnets are written as a bencoded {"magnet-uri": ...}
+    dictionary, which rTorrent accepts in place of a .torrent.
+    """
+
+    supports_watch_dir = True
+
+    STATUS_METHODS = (
+        "d.name",
+        "d.size_bytes",
+        "d.selected_size_bytes",
+        "d.completed_bytes",
+        "d.complete",
+        "d.wanted_chunks",
+        "d.directory",
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+    ):
+        if username and password:
+            protocol, url_rest = base_url.split("://", 1)
+            base_url = f"{protocol}://{username}:{password}@{url_rest}"
+
+        super().__init__(base_url, username, password)
+        print(f"[3/3] Connected to rTorrent at: {base_url}")
+
+    @property
+    def rpc_server(self) -> ServerProxy:
+        """
+        This thread's ServerProxy. A proxy's transport keeps a single
+        HTTP connection, so threads polling in parallel (watch_many)
+        must not share one.
+        """
+        rpc_server = getattr(self._thread_local, "rpc_server", None)
+        if rpc_server is None:
+            rpc_server = ServerProxy(
+                self.base_url, transport=_xmlrpc_transport(self.base_url)
+            )
+            self._thread_local.rpc_server = rpc_server
+        return rpc_server
+
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        info_hash = extract_info_hash_from_magnet(magnet_link)
+        if not info_hash:
+            raise RuntimeError("Failed to extract info hash from magnet link")
+
+        try:
+            self.rpc_server.load.start("", magnet_link)
+            print("  Successfully added magnet to rTorrent")
+        except Exception as e:
+            print(f"  Error with primary method: {e}")
+            print("  Trying alternative method...")
+            self.rpc_server.load.start_verbose("", magnet_link)
+            print("  Successfully added magnet using alternative method")
+
+        # d.hash is uppercase hex; match it so handles compare equal to
+        # the ones list_finished_torrents() and resolve_handles() return
+        return TorrentHandle(handle_id=info_hash.upper())
+
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        self.rpc_server.load.raw_start("", Binary(metainfo))
+        print("  Successfully added cached .torrent to rTorrent")
+        return TorrentHandle(handle_id=info_hash.upper())
+
+    def export_metainfo(self, handle: TorrentHandle) -> Optional[bytes]:
+        # rTorrent keeps <HASH>.torrent in its session directory; this is
+        # only readable when that directory is shared with this process
+        session_path = str(self.rpc_server.session.path())
+        if not session_path:
+            return None
+        try:
+            return (
+                Path(session_path) / f"{handle.handle_id.upper()}.torrent"
+            ).read_bytes()
+        except OSError:
+            return None
+
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        return self.get_torrent_statuses([handle])[handle]
+
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        calls = [
+            {"methodName": method, "params": [handle.handle_id]}
+            for handle in handles
+            for method in self.STATUS_METHODS
+        ]
+        try:
+            results = self.rpc_server.system.multicall(calls)
+        except Exception as e:
+            print(f"\n  Error querying rTorrent: {e}")
+            return {handle: TorrentStatus() for handle in handles}
+
+        statuses: dict[TorrentHandle, TorrentStatus] = {}
+        width = len(self.STATUS_METHODS)
+        for index, handle in enumerate(handles):
+            values = results[index * width : (index + 1) * width]
+            # Successful calls come back as one-element lists, faults
+            # (e.g. unknown hash) as dicts
+            if any(not isinstance(value, list) for value in values):
+                statuses[handle] = TorrentStatus()
+                continue
+
+            (
+                name,
+                total_size,
+                selected_size,
+                downloaded,
+                complete,
+                wanted_chunks,
+                directory,
+            ) = (value[0] for value in values)
+            total_size = int(total_size)
+            selected_size = int(selected_size) or total_size
+            # With skipped files d.complete stays 0; the selection is
+            # done once no wanted chunks remain
+            has_selection = selected_size < total_size
+            statuses[handle] = TorrentStatus(
+                name=name,
+                total_size_bytes=selected_size,
+                downloaded_bytes=min(int(downloaded), selected_size),
+                is_complete=complete == 1
+                or (has_selection and int(wanted_chunks) == 0),
+                download_directory=str(directory),
+            )
+        return statuses
+
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        rows = self.rpc_server.f.multicall(
+            handle.handle_id, "", "f.path=", "f.size_bytes="
+        )
+        return [
+            TorrentFile(index=index, path=path, size_bytes=int(size))
+            for index, (path, size) in enumerate(rows)
+        ]
+
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        wanted_indices = {torrent_file.index for torrent_file in wanted}
+        calls = [
+            {
+                "methodName": "f.priority.set",
+                "params": [f"{handle.handle_id}:f{torrent_file.index}", 0],
+            }
+            for torrent_file in files
+            if torrent_file.index not in wanted_indices
+        ]
+        calls.append(
+            {"methodName": "d.update_priorities", "params": [handle.handle_id]}
+        )
+        self.rpc_server.system.multicall(calls)
+
+    def get_transfer_stats(self) -> TransferStats:
+        return TransferStats(
+            download_rate_bytes_per_second=int(
+                self.rpc_server.throttle.global_down.rate()
+            )
+        )
+
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        rows = self.rpc_server.d.multicall2(
+            "",
+            "complete",
+            "d.hash=",
+            "d.name=",
+            "d.ratio=",
+            "d.timestamp.finished=",
+        )
+        return [
+            FinishedTorrent(
+                handle=TorrentHandle(handle_id=str(hash_id).upper()),
+                name=name,
+                # d.ratio is reported in thousandths
+                ratio=int(ratio) / 1000,
+                completed_at=float(finished_at or 0),
+            )
+            for hash_id, name, ratio, finished_at in rows
+        ]
+
+    def remove_torrents(self, handles: list[TorrentHandle]) -> None:
+        self.rpc_server.system.multicall(
+            [
+                {"methodName": "d.erase", "params": [handle.handle_id]}
+                for handle in handles
+            ]
+        )
+
+    def watch_dir_file(self, magnet_link: str) -> tuple[str, bytes]:
+        magnet_bytes = magnet_link.encode("utf-8")
+        return (
+            ".torrent",
+            b"d10:magnet-uri%d:%se" % (len(magnet_bytes), magnet_bytes),
+        )
+
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        loaded = {
+            str(hash_id).lower() for hash_id in self.rpc_server.download_list()
+        }
+        return {
+            info_hash: TorrentHandle(handle_id=info_hash.upper())
+            for info_hash in info_hashes
+            if info_hash.lower() in loaded
+        }
+
+
+class QBittorrentClient(TorrentClient):
+    """
+    qBittorrent client via Web API (cookie-based auth).
+
+    API: RESTful HTTP API with cookie authentication
+    Default URL: http://localhost:8080
+    Requires: WebUI enabled in qBittorrent settings
+
+    Endpoints used:
+      - POST /api/v2/auth/login - Authenticate and get cookie
+      - POST /api/v2/torrents/add - Add magnet link or .torrent file
+      - GET /api/v2/torrents/info?hashes=... - Query torrent status
+      - POST /api/v2/torrents/export - Export .torrent (WebAPI 2.8.14+)
+      - GET /api/v2/torrents/files - List files of a torrent
+      - POST /api/v2/torrents/filePrio - Skip files (priority 0)
+      - GET /api/v2/transfer/info - Global transfer stats
+      - POST /api/v2/torrents/delete - Remove torrents (keeps data)
+
+    Docs: https://github.com/qbittorrent/qBittorrent/wiki/WebUI-API
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+    ):
+        super().__init__(base_url.rstrip("/"), username, password)
+        self._authenticate()
+        print(f"[3/3] Connected to qBittorrent at: {self.base_url}")
+
+    def _build_api_url(self, endpoint: str) -> str:
+        """Build full API URL from endpoint path."""
+        return urljoin(self.base_url + "/", endpoint.lstrip("/"))
+
+    def _authenticate(self) -> None:
+        """Authenticate with qBittorrent and obtain session cookie."""
+        if not self.username or not self.password:
+            raise RuntimeError(
+                "qBittorrent requires TORRENT_USER and TORRENT_PASSWORD"
+            )
+
+        response = self.session.post(
+            self._build_api_url("/api/v2/auth/login"),
+            data={"username": self.username, "password": self.password},
+            timeout=10,
+        )
+
+        if response.status_code != 200 or "Ok." not in response.text:
+            raise RuntimeError(
+                f"qBittorrent login failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        info_hash = extract_info_hash_from_magnet(magnet_link)
+        if not info_hash:
+            raise RuntimeError("Failed to extract info hash from magnet link")
+
+        response = self.session.post(
+            self._build_api_url("/api/v2/torrents/add"),
+            data={"urls": magnet_link},
+            timeout=20,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent add failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+        print("  Successfully added magnet to qBittorrent")
+        return TorrentHandle(handle_id=info_hash.lower())
+
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        response = self.session.post(
+            self._build_api_url("/api/v2/torrents/add"),
+            files={
+                "torrents": (
+                    f"{info_hash.lower()}.torrent",
+                    metainfo,
+                    "application/x-bittorrent",
+                )
+            },
+            timeout=20,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent add failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+        print("  Successfully added cached .torrent to qBittorrent")
+        return TorrentHandle(handle_id=info_hash.lower())
+
+    def export_metainfo(self, handle: TorrentHandle) -> Optional[bytes]:
+        response = self.session.post(
+            self._build_api_url("/api/v2/torrents/export"),
+            data={"hash": handle.handle_id},
+            timeout=10,
+        )
+
+        # 404 on older WebAPI versions, 409 while metadata is pending
+        if response.status_code != 200:
+            return None
+        return response.content
+
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        response = self.session.get(
+            self._build_api_url("/api/v2/torrents/info"),
+            params={"hashes": handle.handle_id},
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            return TorrentStatus()
+
+        torrents = response.json()
+        if not torrents:
+            return TorrentStatus()
+
+        return self._parse_status(torrents[0])
+
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        response = self.session.get(
+            self._build_api_url("/api/v2/torrents/info"),
+            params={"hashes": "|".join(h.handle_id for h in handles)},
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            return {handle: TorrentStatus() for handle in handles}
+
+        torrents_by_hash = {
+            str(torrent_info.get("hash", "")).lower(): torrent_info
+            for torrent_info in response.json() or []
+        }
+        return {
+            handle: (
+                self._parse_status(torrents_by_hash[handle.handle_id.lower()])
+                if handle.handle_id.lower() in torrents_by_hash
+                else TorrentStatus()
+            )
+            for handle in handles
+        }
+
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        response = self.session.get(
+            self._build_api_url("/api/v2/torrents/info"),
+            params={"hashes": "|".join(info_hashes)},
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent torrents/info failed: "
+                f"HTTP {response.status_code}"
+            )
+
+        known = {
+            str(torrent_info.get("hash", "")).lower()
+            for torrent_info in response.json() or []
+        }
+        return {
+            info_hash: TorrentHandle(handle_id=info_hash.lower())
+            for info_hash in info_hashes
+            if info_hash.lower() in known
+        }
+
+    def get_transfer_stats(self) -> TransferStats:
+        response = self.session.get(
+            self._build_api_url("/api/v2/transfer/info"), timeout=10
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent transfer/info failed: "
+                f"HTTP {response.status_code}"
+            )
+
+        transfer_info = response.json() or {}
+        return TransferStats(
+            download_rate_bytes_per_second=int(
+                transfer_info.get("dl_info_speed", 0) or 0
+            )
+        )
+
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        response = self.session.get(
+            self._build_api_url("/api/v2/torrents/info"),
+            params={"filter": "completed"},
+            timeout=30,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent torrents/info failed: "
+                f"HTTP {response.status_code}"
+            )
+
+        return [
+            FinishedTorrent(
+                handle=TorrentHandle(handle_id=str(info["hash"]).lower()),
+                name=info.get("name", "") or "",
+                ratio=float(info.get("ratio", 0.0) or 0.0),
+                completed_at=float(max(0, info.get("completion_on", 0) or 0)),
+            )
+            for info in response.json() or []
+            if info.get("hash")
+        ]
+
+    def remove_torrents(self, handles: list[TorrentHandle]) -> None:
+        response = self.session.post(
+            self._build_api_url("/api/v2/torrents/delete"),
+            data={
+                "hashes": "|".join(handle.handle_id for handle in handles),
+                "deleteFiles": "false",
+            },
+            timeout=30,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent delete failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        response = self.session.get(
+            self._build_api_url("/api/v2/torrents/files"),
+            params={"hash": handle.handle_id},
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent torrents/files failed: "
+                f"HTTP {response.status_code}"
+            )
+
+        return [
+            TorrentFile(
+                index=int(file_info.get("index", index)),
+                path=file_info.get("name", "") or "",
+                size_bytes=int(file_info.get("size", 0) or 0),
+            )
+            for index, file_info in enumerate(response.json() or [])
+        ]
+
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        wanted_indices = {torrent_file.index for torrent_file in wanted}
+        response = self.session.post(
+            self._build_api_url("/api/v2/torrents/filePrio"),
+            data={
+                "hash": handle.handle_id,
+                "id": "|".join(
+                    str(torrent_file.index)
+                    for torrent_file in files
+                    if torrent_file.index not in wanted_indices
+                ),
+                "priority": "0",
+            },
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"qBittorrent filePrio failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+    @staticmethod
+    def _parse_status(torrent_info: dict) -> TorrentStatus:
+        """Build a TorrentStatus from a torrents/info entry."""
+        name = torrent_info.get("name", "") or ""
+        total_size = int(torrent_info.get("size", 0) or 0)
+        downloaded = int(torrent_info.get("completed", 0) or 0)
+        progress = float(torrent_info.get("progress", 0.0) or 0.0)
+        is_complete = progress >= 1.0
+        directory = torrent_info.get("save_path", "") or ""
+
+        return TorrentStatus(
+            name=name,
+            total_size_bytes=total_size,
+            downloaded_bytes=downloaded,
+            is_complete=is_complete,
+            download_directory=directory,
+        )
+
+
+class TransmissionClient(TorrentClient):
+    """
+    Transmission client via JSON-RPC.
+
+    API: JSON-RPC over HTTP with session ID handshake
+    Default URL: http://localhost:9091/transmission/rpc
+    Requires: RPC enabled in Transmission settings
+
+    Special handling: Transmission requires X-Transmission-Session-Id
+    header. First request returns 409 with correct session ID, then
+    retry.
+
+    RPC methods used:
+      - torrent-add - Add magnet link (filename) or .torrent (metainfo)
+      - torrent-get - Query torrent status (one or many ids per call)
+      - torrent-set - Skip files (files-unwanted)
+      - session-stats - Global transfer stats
+      - torrent-remove - Remove torrents (keeps data)
+
+    Watch directory: Transmission loads "*.torrent" files, and plain
+    text "*.magnet" files since 4.0. Handles for watch-dir adds are
+    resolved with torrent-get, which accepts info hashes as ids.
+
+    Docs: https://github.com/transmission/transmission/blob/main/docs/rpc-spec.md
+    """
+
+    supports_watch_dir = True
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+    ):
+        super().__init__(base_url, username, password)
+        self.session_id: Optional[str] = None
+
+        if self.username and self.password:
+            self.session_auth = (self.username, self.password)
+
+        print(f"[3/3] Connected to Transmission RPC at: {self.base_url}")
+
+    def _execute_rpc(self, method: str, arguments: dict) -> dict:
+        """
+        Execute a Transmission RPC call with session ID handshake.
+
+        Args:
+            method: RPC method name
+            arguments: Method arguments dict
+
+        Returns:
+            Response data dict
+
+        Raises:
+            RuntimeError: If RPC call fails
+        """
+        payload = {"method": method, "arguments": arguments}
+
+        headers = {}
+        if self.session_id:
+            headers["X-Transmission-Session-Id"] = self.session_id
+
+        response = self.session.post(
+            self.base_url, json=payload, headers=headers, timeout=15
+        )
+
+        if response.status_code == 409:
+            new_session_id = response.headers.get("X-Transmission-Session-Id")
+            if not new_session_id:
+                raise RuntimeError(
+                    "Transmission returned 409 but no session ID header"
+                )
+            self.session_id = new_session_id
+            headers["X-Transmission-Session-Id"] = self.session_id
+
+            response = self.session.post(
+                self.base_url, json=payload, headers=headers, timeout=15
+            )
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Transmission RPC failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+        data = response.json()
+        if data.get("result") != "success":
+            raise RuntimeError(f"Transmission RPC error: {data!r}")
+
+        return data
+
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        return self._add_torrent({"filename": magnet_link})
+
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        return self._add_torrent(
+            {"metainfo": base64.b64encode(metainfo).decode("ascii")}
+        )
+
+    def _add_torrent(self, arguments: dict) -> TorrentHandle:
+        """Call torrent-add and return a handle for the new torrent."""
+        response_data = self._execute_rpc("torrent-add", arguments)
+        arguments = response_data.get("arguments", {})
+
+        torrent_info = arguments.get("torrent-added") or arguments.get(
+            "torrent-duplicate"
+        )
+        if not torrent_info or "id" not in torrent_info:
+            raise RuntimeError(
+                f"Unexpected Transmission response: {response_data!r}"
+            )
+
+        torrent_id = str(torrent_info["id"])
+        print(
+            f"  Successfully added torrent to Transmission (id={torrent_id})"
+        )
+        return TorrentHandle(handle_id=torrent_id)
+
+    STATUS_FIELDS = [
+        "id",
+        "name",
+        "sizeWhenDone",
+        "haveValid",
+        "percentDone",
+        "isFinished",
+        "downloadDir",
+    ]
+
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        return self.get_torrent_statuses([handle])[handle]
+
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        response_data = self._execute_rpc(
+            "torrent-get",
+            {
+                "ids": [int(handle.handle_id) for handle in handles],
+                "fields": self.STATUS_FIELDS,
+            },
+        )
+
+        torrents = response_data.get("arguments", {}).get("torrents", [])
+        torrents_by_id = {
+            str(torrent.get("id")): torrent for torrent in torrents
+        }
+        return {
+            handle: (
+                self._parse_status(torrents_by_id[handle.handle_id])
+                if handle.handle_id in torrents_by_id
+                else TorrentStatus()
+            )
+            for handle in handles
+        }
+
+    def get_transfer_stats(self) -> TransferStats:
+        response_data = self._execute_rpc("session-stats", {})
+        session_stats = response_data.get("arguments", {})
+        return TransferStats(
+            download_rate_bytes_per_second=int(
+                session_stats.get("downloadSpeed", 0) or 0
+            ),
+            active_torrents=int(session_stats.get("activeTorrentCount", 0)),
+        )
+
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        response_data = self._execute_rpc(
+            "torrent-get",
+            {
+                "fields": [
+                    "id",
+                    "name",
+                    "percentDone",
+                    "uploadRatio",
+                    "doneDate",
+                ]
+            },
+        )
+        torrents = response_data.get("arguments", {}).get("torrents", [])
+        return [
+            FinishedTorrent(
+                handle=TorrentHandle(handle_id=str(torrent["id"])),
+                name=torrent.get("name", "") or "",
+                # uploadRatio is -1 when nothing was uploaded yet
+                ratio=max(0.0, float(torrent.get("uploadRatio", 0) or 0)),
+                completed_at=float(torrent.get("doneDate", 0) or 0),
+            )
+            for torrent in torrents
+            if float(torrent.get("percentDone", 0) or 0) >= 1.0
+        ]
+
+    def remove_torrents(self, handles: list[TorrentHandle]) -> None:
+        self._execute_rpc(
+            "torrent-remove",
+            {
+                "ids": [int(handle.handle_id) for handle in handles],
+                "delete-local-data": False,
+            },
+        )
+
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        response_data = self._execute_rpc(
+            "torrent-get",
+            {"ids": [int(handle.handle_id)], "fields": ["files"]},
+        )
+        torrents = response_data.get("arguments", {}).get("torrents", [])
+        files = torrents[0].get("files", []) if torrents else []
+        return [
+            TorrentFile(
+                index=index,
+                path=torrent_file.get("name", ""),
+                size_bytes=int(torrent_file.get("length", 0) or 0),
+            )
+            for index, torrent_file in enumerate(files)
+        ]
+
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        wanted_indices = {torrent_file.index for torrent_file in wanted}
+        self._execute_rpc(
+            "torrent-set",
+            {
+                "ids": [int(handle.handle_id)],
+                "files-unwanted": [
+                    torrent_file.index
+                    for torrent_file in files
+                    if torrent_file.index not in wanted_indices
+                ],
+            },
+        )
+
+    def watch_dir_file(self, magnet_link: str) -> tuple[str, bytes]:
+        return ".magnet", magnet_link.encode("utf-8")
+
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        response_data = self._execute_rpc(
+            "torrent-get",
+            {"ids": list(info_hashes), "fields": ["id", "hashString"]},
+        )
+        torrents = response_data.get("arguments", {}).get("torrents", [])
+        return {
+            str(torrent["hashString"]).lower(): TorrentHandle(
+                handle_id=str(torrent["id"])
+            )
+            for torrent in torrents
+            if "id" in torrent and "hashString" in torrent
+        }
+
+    @staticmethod
+    def _parse_status(torrent: dict) -> TorrentStatus:
+        """Build a TorrentStatus from a torrent-get entry."""
+        name = torrent.get("name", "") or ""
+        # sizeWhenDone and percentDone only count wanted files
+        total_size = int(torrent.get("sizeWhenDone", 0) or 0)
+        downloaded = min(int(torrent.get("haveValid", 0) or 0), total_size)
+        percent_done = float(torrent.get("percentDone", 0.0) or 0.0)
+        is_finished = bool(torrent.get("isFinished"))
+        is_complete = is_finished or percent_done >= 1.0
+        directory = torrent.get("downloadDir", "") or ""
+
+        return TorrentStatus(
+            name=name,
+            total_size_bytes=total_size,
+            downloaded_bytes=downloaded,
+            is_complete=is_complete,
+            download_directory=directory,
+        )
+
+
+class DelugeClient(TorrentClient):
+    """
+    Deluge client via JSON-RPC (Web API).
+
+    API: JSON-RPC over HTTP with cookie-based auth
+    Default URL: http://localhost:8112/json
+    Requires: Web UI enabled in Deluge settings
+
+    RPC methods used:
+      - auth.login - Authenticate with password
+      - web.connected / web.get_hosts / web.connect - Connect the web
+        UI to the daemon
+      - web.add_torrents - Add magnet link
+      - core.add_torrent_file - Add .torrent file (base64 metainfo)
+      - core.get_torrent_status - Query status
+      - core.get_torrents_status - Query status of many torrents
+      - core.get_session_status - Global transfer stats
+      - core.set_torrent_options - Skip files (file_priorities)
+      - core.remove_torrents / core.remove_torrent - Remove (keeps data)
+      - web.register_event_listener / web.get_events - Torrent events
+        (see DelugeEventStream)
+
+    Docs: https://deluge.readthedocs.io/en/latest/reference/api.html
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+    ):
+        super().__init__(base_url, username, password)
+        # next() on a count is atomic, so threads never reuse an id
+        self._request_ids = itertools.count(1)
+        self._authenticate()
+        print(f"[3/3] Connected to Deluge at: {self.base_url}")
+
+    def _execute_rpc(
+        self, method: str, params: list, timeout: float = 15
+    ) -> Any:
+        """
+        Execute a Deluge JSON-RPC call.
+
+        Args:
+            method: RPC method name
+            params: List of method parameters
+            timeout: Request timeout in seconds
+
+        Returns:
+            Result from RPC response
+
+        Raises:
+            RuntimeError: If RPC call fails
+        """
+        return self._post_rpc(
+            self.session, next(self._request_ids), method, params, timeout
+        )
+
+    def _post_rpc(
+        self,
+        session: requests.Session,
+        request_id: int,
+        method: str,
+        params: list,
+        timeout: float,
+    ) -> Any:
+        """Send one JSON-RPC call on `session` (see _execute_rpc())."""
+        payload = {
+            "method": method,
+            "params": params,
+            "id": request_id,
+        }
+
+        response = session.post(self.base_url, json=payload, timeout=timeout)
 
         if response.status_code != 200:
             raise RuntimeError(
-                f"Transmission RPC failed: HTTP {response.status_code} "
+                f"Deluge RPC failed: HTTP {response.status_code} "
+                f"response={response.text!r}"
+            )
+
+        data = response.json()
+        if "error" in data and data["error"]:
+            raise RuntimeError(f"Deluge RPC error: {data['error']!r}")
+
+        return data.get("result")
+
+    def _authenticate(
+        self, execute_rpc: Optional[Callable[[str, list], Any]] = None
+    ) -> None:
+        """
+        Authenticate with Deluge Web UI.
+
+        Args:
+            execute_rpc: RPC function of the web session to log in
+                (defaults to the client's own _execute_rpc)
+        """
+        execute_rpc = execute_rpc or self._execute_rpc
+        if not self.password:
+            raise RuntimeError(
+                "Deluge requires TORRENT_PASSWORD (default: 'deluge')"
+            )
+
+        try:
+            result = execute_rpc("auth.check_session", [])
+            if result:
+                return
+        except Exception:
+            pass
+
+        result = execute_rpc("auth.login", [self.password])
+        if not result:
+            raise RuntimeError("Deluge authentication failed")
+
+        # The web UI's daemon connection is shared by all web sessions;
+        # reconnecting would drop it for the other session too
+        if execute_rpc("web.connected", []):
+            return
+        hosts = execute_rpc("web.get_hosts", [])
+        if hosts and len(hosts) > 0:
+            host_id = hosts[0][0]
+            execute_rpc("web.connect", [host_id])
+
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        info_hash = extract_info_hash_from_magnet(magnet_link)
+        if not info_hash:
+            raise RuntimeError("Failed to extract info hash from magnet link")
+
+        result = self._execute_rpc(
+            "web.add_torrents", 
+            [[{"path": magnet_link, "options": {}}]]
+        )
+
+        if not result or not result[0]:
+            raise RuntimeError("Deluge add_torrents failed")
+
+        print("  Successfully added magnet to Deluge")
+        return TorrentHandle(handle_id=info_hash.lower())
+
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        torrent_id = self._execute_rpc(
+            "core.add_torrent_file",
+            [
+                f"{info_hash.lower()}.torrent",
+                base64.b64encode(metainfo).decode("ascii"),
+                {},
+            ],
+        )
+
+        print("  Successfully added cached .torrent to Deluge")
+        return TorrentHandle(handle_id=(torrent_id or info_hash).lower())
+
+    STATUS_FIELDS = [
+        "name",
+        "total_wanted",
+        "total_done",
+        "progress",
+        "is_finished",
+        "save_path",
+    ]
+
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        status_dict = self._execute_rpc(
+            "core.get_torrent_status", [handle.handle_id, self.STATUS_FIELDS]
+        )
+
+        if not status_dict:
+            return TorrentStatus()
+
+        return self._parse_status(status_dict)
+
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        statuses_by_id = (
+            self._execute_rpc(
+                "core.get_torrents_status",
+                [
+                    {"id": [handle.handle_id for handle in handles]},
+                    self.STATUS_FIELDS,
+                ],
+            )
+            or {}
+        )
+        return {
+            handle: (
+                self._parse_status(statuses_by_id[handle.handle_id])
+                if statuses_by_id.get(handle.handle_id)
+                else TorrentStatus()
+            )
+            for handle in handles
+        }
+
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        statuses_by_id = (
+            self._execute_rpc(
+                "core.get_torrents_status",
+                [
+                    {"id": [info_hash.lower() for info_hash in info_hashes]},
+                    ["name"],
+                ],
+            )
+            or {}
+        )
+        return {
+            info_hash: TorrentHandle(handle_id=info_hash.lower())
+            for info_hash in info_hashes
+            if info_hash.lower() in statuses_by_id
+        }
+
+    def get_transfer_stats(self) -> TransferStats:
+        session_status = (
+            self._execute_rpc(
+                "core.get_session_status", [["payload_download_rate"]]
+            )
+            or {}
+        )
+        return TransferStats(
+            download_rate_bytes_per_second=int(
+                session_status.get("payload_download_rate", 0) or 0
+            )
+        )
+
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        statuses_by_id = (
+            self._execute_rpc(
+                "core.get_torrents_status",
+                [{}, ["name", "ratio", "is_finished", "completed_time"]],
+            )
+            or {}
+        )
+        return [
+            FinishedTorrent(
+                handle=TorrentHandle(handle_id=torrent_id),
+                name=status.get("name", "") or "",
+                # ratio is -1 when nothing was uploaded yet
+                ratio=max(0.0, float(status.get("ratio", 0) or 0)),
+                completed_at=float(status.get("completed_time", 0) or 0),
+            )
+            for torrent_id, status in statuses_by_id.items()
+            if status.get("is_finished")
+        ]
+
+    def remove_torrents(self, handles: list[TorrentHandle]) -> None:
+        torrent_ids = [handle.handle_id for handle in handles]
+        try:
+            # Deluge 2.x batch removal
+            self._execute_rpc("core.remove_torrents", [torrent_ids, False])
+        except RuntimeError:
+            for torrent_id in torrent_ids:
+                self._execute_rpc("core.remove_torrent", [torrent_id, False])
+
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        status_dict = (
+            self._execute_rpc(
+                "core.get_torrent_status", [handle.handle_id, ["files"]]
+            )
+            or {}
+        )
+        return [
+            TorrentFile(
+                index=int(torrent_file.get("index", index)),
+                path=torrent_file.get("path", ""),
+                size_bytes=int(torrent_file.get("size", 0) or 0),
+            )
+            for index, torrent_file in enumerate(status_dict.get("files", []))
+        ]
+
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        wanted_indices = {torrent_file.index for torrent_file in wanted}
+        priorities = [0] * len(files)
+        for torrent_file in files:
+            if torrent_file.index in wanted_indices:
+                # 4 is Deluge's "normal" priority
+                priorities[torrent_file.index] = 4
+        self._execute_rpc(
+            "core.set_torrent_options",
+            [[handle.handle_id], {"file_priorities": priorities}],
+        )
+
+    @staticmethod
+    def _parse_status(status_dict: dict) -> TorrentStatus:
+        """Build a TorrentStatus from a Deluge status dict."""
+        name = status_dict.get("name", "") or ""
+        # total_wanted, total_done and progress only count wanted files
+        total_size = int(status_dict.get("total_wanted", 0) or 0)
+        downloaded = int(status_dict.get("total_done", 0) or 0)
+        progress = float(status_dict.get("progress", 0.0) or 0.0)
+        is_complete = bool(status_dict.get("is_finished")) or progress >= 100.0
+        directory = status_dict.get("save_path", "") or ""
+
+        return TorrentStatus(
+            name=name,
+            total_size_bytes=total_size,
+            downloaded_bytes=downloaded,
+            is_complete=is_complete,
+            download_directory=directory,
+        )
+
+
+class Aria2Client(TorrentClient):
+    """
+    aria2 client via JSON-RPC.
+
+    API: JSON-RPC 2.0 over HTTP (optional token auth)
+    Default URL: http://localhost:6800/jsonrpc
+    Requires: RPC enabled (--enable-rpc flag)
+
+    Auth: Uses secret token in RPC params (if configured)
+    Set TORRENT_PASSWORD to your aria2 RPC secret
+
+    RPC methods used:
+      - aria2.addUri - Add magnet link (returns GID)
+      - aria2.addTorrent - Add .torrent file (returns GID)
+      - aria2.tellStatus - Query download status (following a magnet's
+        metadata download to the real download via followedBy)
+      - aria2.getFiles - List files of a download
+      - aria2.changeOption - Skip files (select-file)
+      - system.multicall - Batch tellStatus calls for many downloads
+      - aria2.getGlobalStat - Global transfer stats
+      - aria2.tellActive / aria2.tellStopped - List finished downloads
+      - aria2.removeDownloadResult - Remove a stopped download
+      - aria2.forceRemove - Stop a seeding download
+
+    Docs: https://aria2.github.io/manual/en/html/aria2c.html#rpc-interface
+    """
+
+    # tellStatus has no completion timestamp
+    reports_completion_time = False
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+    ):
+        super().__init__(base_url, username, password)
+        # next() on a count is atomic, so threads never reuse an id
+        self._request_ids = itertools.count(1)
+
+        self.token = f"token:{password}" if password else None
+        # addUri on a magnet returns the GID of a metadata download;
+        # once that finishes aria2 continues under a new GID
+        self._followed_gids: dict[str, str] = {}
+
+        print(f"[3/3] Connected to aria2 at: {self.base_url}")
+
+    def _gid(self, handle: TorrentHandle) -> str:
+        """GID of the download a handle currently refers to."""
+        return self._followed_gids.get(handle.handle_id, handle.handle_id)
+
+    def _execute_rpc(self, method: str, params: list) -> Any:
+        """
+        Execute an aria2 JSON-RPC 2.0 call.
+
+        Args:
+            method: RPC method name (e.g., "aria2.addUri")
+            params: List of method parameters
+
+        Returns:
+            Result from RPC response
+
+        Raises:
+            RuntimeError: If RPC call fails
+        """
+        # system.* methods take no token; multicall entries carry their own
+        if self.token and not method.startswith("system."):
+            params = [self.token] + params
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": str(next(self._request_ids)),
+            "method": method,
+            "params": params,
+        }
+
+        response = self.session.post(self.base_url, json=payload, timeout=15)
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"aria2 RPC failed: HTTP {response.status_code} "
                 f"response={response.text!r}"
             )
 
-        data = response.json()
-        if data.get("result") != "success":
-            raise RuntimeError(f"Transmission RPC error: {data!r}")
+        data = response.json()
+        if "error" in data:
+            raise RuntimeError(
+                f"aria2 RPC error: {data['error'].get('message', data['error'])}"
+            )
+
+        return data.get("result")
+
+    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        gid = self._execute_rpc("aria2.addUri", [[magnet_link]])
+
+        if not gid:
+            raise RuntimeError("aria2 addUri returned no GID")
+
+        print(f"  Successfully added magnet to aria2 (GID={gid})")
+        return TorrentHandle(handle_id=gid)
+
+    def add_torrent_file(
+        self, metainfo: bytes, info_hash: str
+    ) -> TorrentHandle:
+        gid = self._execute_rpc(
+            "aria2.addTorrent",
+            [base64.b64encode(metainfo).decode("ascii"), []],
+        )
+
+        if not gid:
+            raise RuntimeError("aria2 addTorrent returned no GID")
+
+        print(f"  Successfully added cached .torrent to aria2 (GID={gid})")
+        return TorrentHandle(handle_id=gid)
+
+    STATUS_KEYS = [
+        "gid",
+        "totalLength",
+        "completedLength",
+        "status",
+        "dir",
+        "bittorrent",
+        "followedBy",
+    ]
+
+    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
+        return self.get_torrent_statuses([handle])[handle]
+
+    def get_torrent_statuses(
+        self, handles: list[TorrentHandle]
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        statuses: dict[TorrentHandle, TorrentStatus] = {}
+        pending = list(handles)
+        while pending:
+            results = self._multicall(
+                [
+                    ("aria2.tellStatus", [self._gid(handle), self.STATUS_KEYS])
+                    for handle in pending
+                ]
+            )
+            followed: list[TorrentHandle] = []
+            for handle, result in zip(pending, results):
+                # Successful calls come back as one-element lists, errors
+                # as {"code": ..., "message": ...}
+                if not (isinstance(result, list) and result and result[0]):
+                    statuses[handle] = TorrentStatus()
+                    continue
+                status_dict = result[0]
+                if status_dict.get("followedBy"):
+                    # Finished metadata download; query the real one
+                    self._followed_gids[handle.handle_id] = status_dict[
+                        "followedBy"
+                    ][0]
+                    followed.append(handle)
+                else:
+                    statuses[handle] = self._parse_status(status_dict)
+            pending = followed
+        return statuses
+
+    def get_transfer_stats(self) -> TransferStats:
+        global_stat = self._execute_rpc("aria2.getGlobalStat", []) or {}
+        return TransferStats(
+            download_rate_bytes_per_second=int(
+                global_stat.get("downloadSpeed", 0) or 0
+            ),
+            active_torrents=int(global_stat.get("numActive", 0) or 0),
+        )
+
+    def _multicall(self, calls: list[tuple[str, list]]) -> list:
+        """Run several aria2 methods in one system.multicall."""
+        token_params = [self.token] if self.token else []
+        return (
+            self._execute_rpc(
+                "system.multicall",
+                [
+                    [
+                        {"methodName": method, "params": token_params + params}
+                        for method, params in calls
+                    ]
+                ],
+            )
+            or []
+        )
+
+    def list_finished_torrents(self) -> list[FinishedTorrent]:
+        keys = [
+            "gid",
+            "status",
+            "totalLength",
+            "completedLength",
+            "uploadLength",
+            "bittorrent",
+            "followedBy",
+        ]
+        active, stopped = self._multicall(
+            [
+                ("aria2.tellActive", [keys]),
+                ("aria2.tellStopped", [0, 1000, keys]),
+            ]
+        )
+
+        downloads = (active[0] if isinstance(active, list) else []) + (
+            stopped[0] if isinstance(stopped, list) else []
+        )
+        for download in downloads:
+            if download.get("followedBy"):
+                gid = download["gid"]
+                self._followed_gids[gid] = download["followedBy"][0]
+        # Report followed downloads under the metadata GID that
+        # add_magnet_link() handed out
+        handle_ids = {
+            gid: handle_id for handle_id, gid in self._followed_gids.items()
+        }
+
+        finished: list[FinishedTorrent] = []
+        for download in downloads:
+            if download.get("followedBy"):
+                continue
+            total_length = int(download.get("totalLength", 0) or 0)
+            completed_length = int(download.get("completedLength", 0) or 0)
+            # Seeding downloads are active; force-removed ones are
+            # "removed" and only leave the list via removeDownloadResult
+            is_done = (
+                download.get("status") in ("active", "removed")
+                and total_length > 0
+                and completed_length >= total_length
+            )
+            if download.get("status") != "complete" and not is_done:
+                continue
+
+            upload_length = int(download.get("uploadLength", 0) or 0)
+            bittorrent_info = download.get("bittorrent", {}) or {}
+            finished.append(
+                FinishedTorrent(
+                    handle=TorrentHandle(
+                        handle_id=handle_ids.get(
+                            download["gid"], download["gid"]
+                        )
+                    ),
+                    name=bittorrent_info.get("info", {}).get("name", ""),
+                    ratio=upload_length / total_length if total_length else 0,
+                )
+            )
+        return finished
+
+    def remove_torrents(
+        self,
+        handles: list[TorrentHandle],
+        stop_timeout_seconds: float = 5,
+    ) -> None:
+        # Remove the real download and, for magnets, the metadata
+        # download's result too
+        downloads = [
+            TorrentHandle(handle_id=self._gid(handle)) for handle in handles
+        ] + [
+            TorrentHandle(handle_id=handle.handle_id)
+            for handle in handles
+            if self._followed_gids.pop(handle.handle_id, None)
+        ]
+        pending = self._remove_download_results(downloads)
+        if not pending:
+            return
+
+        # Seeding downloads are still active; stop them, then clear their
+        # results once aria2 has moved them to the stopped list
+        self._multicall(
+            [("aria2.forceRemove", [handle.handle_id]) for handle in pending]
+        )
+        deadline = time.monotonic() + stop_timeout_seconds
+        while pending and time.monotonic() < deadline:
+            time.sleep(_poll_wait_seconds(0.2))
+            pending = self._remove_download_results(pending)
+        # Anything still stopping is listed as "removed" by
+        # list_finished_torrents() and cleared on the next run
+
+    def resolve_handles(
+        self, info_hashes: list[str]
+    ) -> dict[str, TorrentHandle]:
+        keys = ["gid", "infoHash", "followedBy"]
+        results = self._multicall(
+            [
+                ("aria2.tellActive", [keys]),
+                ("aria2.tellWaiting", [0, 1000, keys]),
+                ("aria2.tellStopped", [0, 1000, keys]),
+            ]
+        )
 
-        return data
+        wanted = {info_hash.lower(): info_hash for info_hash in info_hashes}
+        resolved: dict[str, TorrentHandle] = {}
+        for result in results:
+            for download in result[0] if isinstance(result, list) else []:
+                info_hash = wanted.get(str(download.get("infoHash", "")))
+                # A finished magnet metadata download is followed by the
+                # real download under a new GID
+                if info_hash and not download.get("followedBy"):
+                    resolved[info_hash] = TorrentHandle(
+                        handle_id=download["gid"]
+                    )
+        return resolved
+
+    def _remove_download_results(
+        self, handles: list[TorrentHandle]
+    ) -> list[TorrentHandle]:
+        """
+        Clear the results of stopped downloads.
 
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
-        response_data = self._execute_rpc(
-            "torrent-add", {"filename": magnet_link}
+        Returns:
+            Handles whose downloads have not stopped yet
+        """
+        results = self._multicall(
+            [
+                ("aria2.removeDownloadResult", [handle.handle_id])
+                for handle in handles
+            ]
         )
-        arguments = response_data.get("arguments", {})
+        return [
+            handle
+            for handle, result in zip(handles, results)
+            if not isinstance(result, list)
+        ]
 
-        torrent_info = arguments.get("torrent-added") or arguments.get(
-            "torrent-duplicate"
-        )
-        if not torrent_info or "id" not in torrent_info:
-            raise RuntimeError(
-                f"Unexpected Transmission response: {response_data!r}"
+    def get_files(self, handle: TorrentHandle) -> list[TorrentFile]:
+        files = self._execute_rpc("aria2.getFiles", [self._gid(handle)]) or []
+        return [
+            TorrentFile(
+                # aria2 file indexes are 1-based
+                index=int(file_info["index"]) - 1,
+                path=file_info.get("path", "") or "",
+                size_bytes=int(file_info.get("length", 0) or 0),
             )
+            for file_info in files
+        ]
 
-        torrent_id = str(torrent_info["id"])
-        print(f"  Successfully added magnet to Transmission (id={torrent_id})")
-        return TorrentHandle(handle_id=torrent_id)
-
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        torrent_id = int(handle.handle_id)
-        response_data = self._execute_rpc(
-            "torrent-get",
-            {
-                "ids": [torrent_id],
-                "fields": [
-                    "name",
-                    "totalSize",
-                    "haveValid",
-                    "percentDone",
-                    "isFinished",
-                    "downloadDir",
-                ],
-            },
+    def set_files_wanted(
+        self,
+        handle: TorrentHandle,
+        files: list[TorrentFile],
+        wanted: list[TorrentFile],
+    ) -> None:
+        select_file = ",".join(
+            str(torrent_file.index + 1) for torrent_file in wanted
+        )
+        self._execute_rpc(
+            "aria2.changeOption",
+            [self._gid(handle), {"select-file": select_file}],
         )
 
-        torrents = response_data.get("arguments", {}).get("torrents", [])
-        if not torrents:
-            return TorrentStatus()
+    @staticmethod
+    def _parse_status(status_dict: dict) -> TorrentStatus:
+        """Build a TorrentStatus from an aria2.tellStatus result."""
+        name = ""
+        bittorrent_info = status_dict.get("bittorrent")
+        if bittorrent_info and "info" in bittorrent_info:
+            name = bittorrent_info["info"].get("name", "")
 
-        torrent = torrents[0]
-        name = torrent.get("name", "") or ""
-        total_size = int(torrent.get("totalSize", 0) or 0)
-        downloaded = int(torrent.get("haveValid", 0) or 0)
-        percent_done = float(torrent.get("percentDone", 0.0) or 0.0)
-        is_finished = bool(torrent.get("isFinished"))
-        is_complete = is_finished or percent_done >= 1.0
-        directory = torrent.get("downloadDir", "") or ""
+        directory = status_dict.get("dir", "") or ""
+        if bittorrent_info is not None and "info" not in bittorrent_info:
+            # A magnet's metadata download: its single "[METADATA]" file
+            # and completion say nothing about the torrent itself. If it
+            # failed or was removed, report the torrent as gone
+            if status_dict.get("status") in ("error", "removed"):
+                return TorrentStatus()
+            return TorrentStatus(download_directory=directory)
+
+        total_size = int(status_dict.get("totalLength", 0) or 0)
+        downloaded = int(status_dict.get("completedLength", 0) or 0)
+        aria2_status = status_dict.get("status", "")
+        is_complete = aria2_status == "complete"
 
         return TorrentStatus(
             name=name,
@@ -619,306 +3820,1372 @@ class TransmissionClient(TorrentClient):
         )
 
 
-class DelugeClient(TorrentClient):
+def create_torrent_client(
+    client_type: str, url: str, username: str | None, password: str | None
+) -> TorrentClient:
     """
-    Deluge client via JSON-RPC (Web API).
+    Factory function to create the appropriate torrent client.
 
-    API: JSON-RPC over HTTP with cookie-based auth
-    Default URL: http://localhost:8112/json
-    Requires: Web UI enabled in Deluge settings
+    Args:
+        client_type: Client identifier (rtorrent, qbittorrent, etc.)
+        url: Backend URL
+        username: Optional username
+        password: Optional password/token
 
-    RPC methods used:
-      - auth.login - Authenticate with password
-      - core.add_torrent_magnet - Add magnet link
-      - core.get_torrent_status - Query status
+    Returns:
+        Initialized TorrentClient instance
 
-    Docs: https://deluge.readthedocs.io/en/latest/reference/api.html
+    Raises:
+        RuntimeError: If client_type is unsupported
+    """
+    client_type_lower = client_type.strip().lower()
+
+    client_map = {
+        "rtorrent": RTorrentClient,
+        "rutorrent": RTorrentClient,
+        "qbittorrent": QBittorrentClient,
+        "qbit": QBittorrentClient,
+        "qbt": QBittorrentClient,
+        "transmission": TransmissionClient,
+        "trans": TransmissionClient,
+        "deluge": DelugeClient,
+        "aria2": Aria2Client,
+        "aria2c": Aria2Client,
+    }
+
+    client_class = client_map.get(client_type_lower)
+    if not client_class:
+        supported = ", ".join(
+            sorted(set(client_map.values().__name__ for _ in client_map))
+        )
+        raise RuntimeError(
+            f"Unsupported TORRENT_CLIENT='{client_type}'. "
+            f"Supported: {supported}"
+        )
+
+    with profile_stage("client construction/auth"):
+        return client_class(
+            base_url=url, username=username, password=password
+        )
+
+
+@dataclass
+class WatchCallbacks:
+    """
+    Callbacks invoked by watch_many() from the scheduler thread.
+
+    on_complete(handle, status): Torrent finished downloading
+    on_progress(handle, status): New status polled for an active
+        torrent; returning False stops watching it
+    on_error(handle, error): Torrent vanished, timed out or kept failing
+
+    Rate, ETA and stall state for a handle are available from
+    client.telemetry.get(handle) inside any callback; telemetry is
+    discarded once on_complete or on_error returns.
     """
 
+    on_complete: Optional[Callable[[TorrentHandle, TorrentStatus], None]] = (
+        None
+    )
+    on_progress: Optional[
+        Callable[[TorrentHandle, TorrentStatus], Optional[bool]]
+    ] = None
+    on_error: Optional[Callable[[TorrentHandle, Exception], None]] = None
+
+
+class _WatchEntry:
+    """Scheduler bookkeeping for one watched handle."""
+
+    __slots__ = (
+        "handle",
+        "interval_seconds",
+        "deadline",
+        "last_downloaded_bytes",
+        "consecutive_errors",
+        "metadata_resolved",
+        "files_selected",
+    )
+
     def __init__(
-        self,
-        base_url: str,
-        username: str | None = None,
-        password: str | None = None,
+        self, handle: TorrentHandle, interval_seconds: float, deadline: float
     ):
-        super().__init__(base_url, username, password)
-        self.session = requests.Session()
-        self.request_id = 1
-        self._authenticate()
-        print(f"[3/3] Connected to Deluge at: {self.base_url}")
-
-    def _execute_rpc(self, method: str, params: list) -> Any:
-        """
-        Execute a Deluge JSON-RPC call.
+        self.handle = handle
+        self.interval_seconds = interval_seconds
+        self.deadline = deadline
+        self.last_downloaded_bytes = -1
+        self.consecutive_errors = 0
+        self.metadata_resolved = False
+        self.files_selected = False
+
+
+def watch_many(
+    client: TorrentClient,
+    handles: list[TorrentHandle],
+    callbacks: WatchCallbacks | None = None,
+    poll_interval_seconds: float = 10,
+    max_poll_interval_seconds: float = 120,
+    timeout_seconds: float = 3600,
+    batch_size: int = 100,
+    max_workers: int = 4,
+    max_consecutive_errors: int = 3,
+    incoming: "queue.Queue[Optional[TorrentHandle]] | None" = None,
+) -> dict[TorrentHandle, Optional[Path]]:
+    """
+    Watch many torrents until each completes, fails or times out.
 
-        Args:
-            method: RPC method name
-            params: List of method parameters
+    Handles are kept in a min-heap ordered by next-due time. Every
+    handle due at the same moment is polled with one batched
+    get_torrent_statuses() call per `batch_size` handles, and batches
+    run on a bounded thread pool. Each handle backs off towards
+    `max_poll_interval_seconds` while it makes no progress and drops
+    back to `poll_interval_seconds` as soon as it does.
 
-        Returns:
-            Result from RPC response
+    Args:
+        client: Backend the handles belong to
+        handles: TorrentHandles to watch
+        callbacks: Optional completion/progress/error callbacks
+        poll_interval_seconds: Interval for torrents making progress
+        max_poll_interval_seconds: Upper bound for stalled torrents
+        timeout_seconds: Per-handle time limit
+        batch_size: Maximum handles per status RPC
+        max_workers: Maximum concurrent status RPCs
+        max_consecutive_errors: Failed polls tolerated before a handle
+            is reported through on_error
+        incoming: Optional queue of handles to start watching while
+            running (e.g. from queue workers as their adds finish);
+            put None to let watch_many() return once idle
 
-        Raises:
-            RuntimeError: If RPC call fails
-        """
-        payload = {
-            "method": method,
-            "params": params,
-            "id": self.request_id,
-        }
-        self.request_id += 1
+    Returns:
+        Mapping of each handle to its download path, or None if it
+        failed or timed out
+    """
+    callbacks = callbacks or WatchCallbacks()
+    results: dict[TorrentHandle, Optional[Path]] = {}
+    started_at = time.monotonic()
+
+    heap: list[tuple[float, int, _WatchEntry]] = []
+    sequence = itertools.count()
+    watched: set[TorrentHandle] = set()
+
+    def start_watching(handle: TorrentHandle, now: float) -> None:
+        if handle in watched:
+            return
+        watched.add(handle)
+        entry = _WatchEntry(
+            handle, poll_interval_seconds, now + timeout_seconds
+        )
+        heapq.heappush(heap, (now, next(sequence), entry))
+
+    for handle in handles:
+        start_watching(handle, started_at)
+    incoming_open = incoming is not None
+
+    def take_incoming(timeout: Optional[float]) -> None:
+        """Start watching queued handles, blocking up to timeout."""
+        nonlocal incoming_open
+        block = timeout is None or timeout > 0
+        while incoming_open:
+            try:
+                handle = incoming.get(block=block, timeout=timeout)
+            except queue.Empty:
+                return
+            if handle is None:
+                incoming_open = False
+            else:
+                start_watching(handle, time.monotonic())
+            block = False
+
+    def poll_batch(
+        batch: list[_WatchEntry],
+    ) -> dict[TorrentHandle, TorrentStatus]:
+        with profile_stage("poll batch"):
+            statuses = client.get_torrent_statuses([e.handle for e in batch])
+        for entry in batch:
+            status = statuses.get(entry.handle)
+            if not status or status.total_size_bytes <= 0:
+                continue
+            if not entry.metadata_resolved:
+                entry.metadata_resolved = True
+                client._on_metadata_resolved(entry.handle)
+            if not entry.files_selected:
+                entry.files_selected = client._apply_file_selection(
+                    entry.handle
+                )
+        return statuses
+
+    def fail(entry: _WatchEntry, error: Exception) -> None:
+        results[entry.handle] = None
+        watched.discard(entry.handle)
+        if callbacks.on_error:
+            callbacks.on_error(entry.handle, error)
+        client.telemetry.discard(entry.handle)
+
+    def reschedule(entry: _WatchEntry, now: float) -> None:
+        due = min(now + entry.interval_seconds, entry.deadline)
+        heapq.heappush(heap, (due, next(sequence), entry))
+
+    def handle_status(
+        entry: _WatchEntry, status: TorrentStatus, now: float
+    ) -> None:
+        if (
+            not status.name
+            and not status.total_size_bytes
+            and not status.download_directory
+        ):
+            fail(entry, RuntimeError("Torrent not found"))
+            return
+
+        entry.consecutive_errors = 0
+        client.telemetry.record(entry.handle, status)
+        if status.is_complete:
+            results[entry.handle] = status.download_path()
+            watched.discard(entry.handle)
+            if callbacks.on_complete:
+                callbacks.on_complete(entry.handle, status)
+            client.telemetry.discard(entry.handle)
+            return
+
+        if (
+            callbacks.on_progress
+            and callbacks.on_progress(entry.handle, status) is False
+        ):
+            watched.discard(entry.handle)
+            client.telemetry.discard(entry.handle)
+            return
+
+        if now >= entry.deadline:
+            fail(
+                entry,
+                TimeoutError(f"Download timed out after {timeout_seconds}s"),
+            )
+            return
 
-        response = self.session.post(self.base_url, json=payload, timeout=15)
+        if status.downloaded_bytes > entry.last_downloaded_bytes:
+            entry.interval_seconds = poll_interval_seconds
+        else:
+            entry.interval_seconds = min(
+                entry.interval_seconds * 2, max_poll_interval_seconds
+            )
+        entry.last_downloaded_bytes = status.downloaded_bytes
+        reschedule(entry, now)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight: dict[Future, list[_WatchEntry]] = {}
+
+        while heap or in_flight or incoming_open:
+            take_incoming(timeout=0)
+            now = time.monotonic()
+
+            # Group every handle that is already due into batches
+            due_entries: list[_WatchEntry] = []
+            while (
+                heap
+                and heap[0][0] <= now
+                and len(in_flight) < max_workers
+                and len(due_entries) < batch_size
+            ):
+                due_entries.append(heapq.heappop(heap)[2])
+                if len(due_entries) == batch_size or not (
+                    heap and heap[0][0] <= now
+                ):
+                    future = executor.submit(poll_batch, due_entries)
+                    in_flight[future] = due_entries
+                    due_entries = []
+
+            wait_seconds = None
+            if heap and len(in_flight) < max_workers:
+                wait_seconds = max(0.0, heap[0][0] - time.monotonic())
+
+            if not in_flight:
+                if incoming_open:
+                    # Idle until the next handle is due or a new one
+                    # arrives
+                    take_incoming(wait_seconds if heap else None)
+                else:
+                    time.sleep(wait_seconds or 0)
+                continue
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Deluge RPC failed: HTTP {response.status_code} "
-                f"response={response.text!r}"
+            done, _ = wait(
+                in_flight, timeout=wait_seconds, return_when=FIRST_COMPLETED
             )
+            now = time.monotonic()
+            for future in done:
+                batch = in_flight.pop(future)
+                try:
+                    statuses = future.result()
+                except Exception as e:
+                    for entry in batch:
+                        entry.consecutive_errors += 1
+                        if entry.consecutive_errors >= max_consecutive_errors:
+                            fail(entry, e)
+                        elif now >= entry.deadline:
+                            fail(entry, TimeoutError("Download timed out"))
+                        else:
+                            entry.interval_seconds = min(
+                                entry.interval_seconds * 2,
+                                max_poll_interval_seconds,
+                            )
+                            reschedule(entry, now)
+                    continue
 
-        data = response.json()
-        if "error" in data and data["error"]:
-            raise RuntimeError(f"Deluge RPC error: {data['error']!r}")
+                for entry in batch:
+                    handle_status(
+                        entry,
+                        statuses.get(entry.handle) or TorrentStatus(),
+                        now,
+                    )
 
-        return data.get("result")
+    return results
 
-    def _authenticate(self) -> None:
-        """Authenticate with Deluge Web UI."""
-        if not self.password:
+
+class WatchDirEnqueuer:
+    """
+    Bulk enqueue through a backend's watch directory instead of RPC.
+
+    Each torrent is written atomically (temp file, then rename) so the
+    backend never loads a partial file. Cached .torrent metainfo is
+    written when available, otherwise the backend-specific magnet file
+    from TorrentClient.watch_dir_file(). After writing, info hashes are
+    mapped back to TorrentHandles with one batched resolve call per
+    poll. Supported by rTorrent and Transmission.
+
+    `watch_dir` is the watch directory as seen by this process, e.g.
+    ./clients/transmission/watch in the compose stack. add() lets
+    queue worker threads share enqueue_many() passes: adds arriving
+    within `batch_window_seconds` of the first are written together.
+    """
+
+    def __init__(
+        self,
+        client: TorrentClient,
+        watch_dir: str | Path,
+        batch_window_seconds: float = 1.0,
+    ):
+        if not client.supports_watch_dir:
             raise RuntimeError(
-                "Deluge requires TORRENT_PASSWORD (default: 'deluge')"
+                f"{type(client).__name__} does not support watch directories"
             )
+        self.client = client
+        self.watch_dir = Path(watch_dir)
+        if not self.watch_dir.is_dir():
+            raise RuntimeError(f"Watch directory not found: {self.watch_dir}")
+        self.batch_window_seconds = batch_window_seconds
+        self._lock = threading.Lock()
+        self._batch: Optional[_WatchDirBatch] = None
+
+    def write(self, magnet_link: str) -> str:
+        """
+        Write one torrent into the watch directory.
 
-        try:
-            result = self._execute_rpc("auth.check_session", [])
-            if result:
-                return
-        except Exception:
-            pass
-
-        result = self._execute_rpc("auth.login", [self.password])
-        if not result:
-            raise RuntimeError("Deluge authentication failed")
-        
-        hosts = self._execute_rpc("web.get_hosts", [])
-        if hosts and len(hosts) > 0:
-            host_id = hosts[0][0]
-            self._execute_rpc("web.connect", [host_id])
+        Returns:
+            Lowercase info hash of the enqueued torrent
 
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
+        Raises:
+            RuntimeError: If the magnet link has no info hash
+        """
         info_hash = extract_info_hash_from_magnet(magnet_link)
         if not info_hash:
             raise RuntimeError("Failed to extract info hash from magnet link")
+        info_hash = info_hash.lower()
 
-        result = self._execute_rpc(
-            "web.add_torrents", 
-            [[{"path": magnet_link, "options": {}}]]
+        metainfo = (
+            self.client.metainfo_cache.get(info_hash)
+            if self.client.metainfo_cache
+            else None
         )
+        if metainfo:
+            suffix, contents = ".torrent", metainfo
+        else:
+            suffix, contents = self.client.watch_dir_file(magnet_link)
 
-        if not result or not result[0]:
-            raise RuntimeError("Deluge add_torrents failed")
+        _write_atomic(self.watch_dir / f"{info_hash}{suffix}", contents)
+        return info_hash
 
-        print("  Successfully added magnet to Deluge")
-        return TorrentHandle(handle_id=info_hash.lower())
+    def enqueue_many(
+        self,
+        magnet_links: list[str],
+        resolve_timeout_seconds: float = 120,
+        poll_interval_seconds: float = 2,
+    ) -> dict[str, TorrentHandle]:
+        """
+        Write all magnet links, then wait for the backend to pick them
+        up.
 
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        fields = [
-            "name",
-            "total_size",
-            "all_time_download",
-            "progress",
-            "is_finished",
-            "save_path",
-        ]
+        Args:
+            magnet_links: Magnet URIs to enqueue
+            resolve_timeout_seconds: How long to wait for the backend
+                to load the files
+            poll_interval_seconds: Time between resolve calls
 
-        status_dict = self._execute_rpc(
-            "core.get_torrent_status", [handle.handle_id, fields]
-        )
+        Returns:
+            Mapping of info hash to TorrentHandle for every torrent the
+            backend loaded in time; missing hashes were not picked up
+        """
+        pending = [self.write(magnet_link) for magnet_link in magnet_links]
+        print(f"  Wrote {len(pending)} torrent(s) to {self.watch_dir}")
+
+        handles: dict[str, TorrentHandle] = {}
+        deadline = time.monotonic() + resolve_timeout_seconds
+        while pending:
+            resolved = self.client.resolve_handles(pending)
+            for info_hash, handle in resolved.items():
+                handles[info_hash] = handle
+                self.client._info_hashes[handle] = info_hash
+            pending = [h for h in pending if h not in resolved]
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(_poll_wait_seconds(poll_interval_seconds))
+
+        if pending:
+            print(
+                f"  Warning: {len(pending)} torrent(s) not picked up from "
+                f"the watch directory"
+            )
+        return handles
 
-        if not status_dict:
-            return TorrentStatus()
+    def add(self, magnet_link: str) -> TorrentHandle:
+        """
+        Enqueue one torrent, batched with concurrent callers. Usable as
+        a drop-in for TorrentClient.add_torrent().
 
-        name = status_dict.get("name", "") or ""
-        total_size = int(status_dict.get("total_size", 0) or 0)
-        downloaded = int(status_dict.get("all_time_download", 0) or 0)
-        progress = float(status_dict.get("progress", 0.0) or 0.0)
-        is_complete = bool(status_dict.get("is_finished")) or progress >= 100.0
-        directory = status_dict.get("save_path", "") or ""
+        Raises:
+            RuntimeError: If the magnet link has no info hash or the
+                backend did not load the torrent
+        """
+        info_hash = extract_info_hash_from_magnet(magnet_link)
+        if not info_hash:
+            raise RuntimeError("Failed to extract info hash from magnet link")
 
-        return TorrentStatus(
-            name=name,
-            total_size_bytes=total_size,
-            downloaded_bytes=downloaded,
-            is_complete=is_complete,
-            download_directory=directory,
+        with self._lock:
+            batch = self._batch
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batch = _WatchDirBatch()
+            batch.magnet_links.append(magnet_link)
+
+        if is_leader:
+            time.sleep(_poll_wait_seconds(self.batch_window_seconds))
+            with self._lock:
+                self._batch = None
+            try:
+                batch.handles = self.enqueue_many(batch.magnet_links)
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error:
+            raise RuntimeError(f"Watch directory add failed: {batch.error}")
+        handle = batch.handles.get(info_hash.lower())
+        if handle is None:
+            raise RuntimeError("Torrent was not loaded from watch directory")
+        return handle
+
+
+class _WatchDirBatch:
+    """Magnet links sharing one WatchDirEnqueuer.enqueue_many() pass."""
+
+    def __init__(self) -> None:
+        self.magnet_links: list[str] = []
+        self.handles: dict[str, TorrentHandle] = {}
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    When finished torrents are pruned from the backend. A torrent is
+    removed once any enabled rule matches; downloaded data is kept.
+
+    remove_after_handoff: Remove torrents passed to
+        RetentionEngine.mark_handed_off()
+    max_seed_ratio: Remove once the upload ratio reaches this value
+    max_seed_seconds: Remove this long after the download finished
+    keep_at_most: Keep only the N most recently finished torrents
+    """
+
+    remove_after_handoff: bool = False
+    max_seed_ratio: Optional[float] = None
+    max_seed_seconds: Optional[float] = None
+    keep_at_most: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.remove_after_handoff
+            or self.max_seed_ratio is not None
+            or self.max_seed_seconds is not None
+            or self.keep_at_most is not None
         )
 
 
-class Aria2Client(TorrentClient):
+class RetentionEngine:
     """
-    aria2 client via JSON-RPC.
+    Prunes finished torrents so backend list/status calls stay fast.
 
-    API: JSON-RPC 2.0 over HTTP (optional token auth)
-    Default URL: http://localhost:6800/jsonrpc
-    Requires: RPC enabled (--enable-rpc flag)
+    run_once() lists finished torrents, applies the RetentionPolicy and
+    removes matches in batches of `batch_size`. start() runs it
+    periodically on a daemon thread to keep it off the critical path.
+
+    Raises:
+        RuntimeError: If the policy ages or orders torrents by
+            completion time and the backend does not report it
+    """
+
+    def __init__(
+        self,
+        client: TorrentClient,
+        policy: RetentionPolicy,
+        batch_size: int = 100,
+    ):
+        if not client.reports_completion_time and (
+            policy.max_seed_seconds is not None
+            or policy.keep_at_most is not None
+        ):
+            raise RuntimeError(
+                f"{type(client).__name__} does not report when torrents "
+                "finished; seed-time and keep-max retention need it"
+            )
+        self.client = client
+        self.policy = policy
+        self.batch_size = batch_size
+        self._handed_off: set[TorrentHandle] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark_handed_off(self, handle: TorrentHandle) -> None:
+        """Record that a torrent's data has been delivered."""
+        with self._lock:
+            self._handed_off.add(handle)
+
+    def select(
+        self, finished: list[FinishedTorrent], now: float | None = None
+    ) -> list[TorrentHandle]:
+        """Return handles of finished torrents the policy removes."""
+        now = time.time() if now is None else now
+        policy = self.policy
+        with self._lock:
+            handed_off = set(self._handed_off)
+
+        doomed: dict[TorrentHandle, None] = {}
+        for torrent in finished:
+            if policy.remove_after_handoff and torrent.handle in handed_off:
+                doomed[torrent.handle] = None
+            elif (
+                policy.max_seed_ratio is not None
+                and torrent.ratio >= policy.max_seed_ratio
+            ):
+                doomed[torrent.handle] = None
+            elif (
+                policy.max_seed_seconds is not None
+                and torrent.completed_at
+                and now - torrent.completed_at >= policy.max_seed_seconds
+            ):
+                doomed[torrent.handle] = None
+
+        if policy.keep_at_most is not None:
+            kept = [t for t in finished if t.handle not in doomed]
+            kept.sort(key=lambda t: t.completed_at, reverse=True)
+            for torrent in kept[policy.keep_at_most :]:
+                doomed[torrent.handle] = None
+
+        return list(doomed)
+
+    def run_once(self) -> int:
+        """
+        Apply the policy once.
+
+        Returns:
+            Number of torrents removed
+        """
+        doomed = self.select(self.client.list_finished_torrents())
+        for start in range(0, len(doomed), self.batch_size):
+            batch = doomed[start : start + self.batch_size]
+            self.client.remove_torrents(batch)
+
+        with self._lock:
+            self._handed_off.difference_update(doomed)
+        return len(doomed)
+
+    def start(self, interval_seconds: float = 600) -> None:
+        """Run the policy every interval_seconds on a daemon thread."""
+
+        def loop() -> None:
+            while not self._stop_event.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"\n  Warning: Retention run failed: {e}")
+                self._stop_event.wait(interval_seconds)
+
+        self._thread = threading.Thread(
+            target=loop, name="retention", daemon=True
+        )
+        self._thread.start()
 
-    Auth: Uses secret token in RPC params (if configured)
-    Set TORRENT_PASSWORD to your aria2 RPC secret
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
 
-    RPC methods used:
-      - aria2.addUri - Add magnet link (returns GID)
-      - aria2.tellStatus - Query download status
 
-    Docs: https://aria2.github.io/manual/en/html/aria2c.html#rpc-interface
+class AdmissionController:
+    """
+    Bandwidth-aware gate in front of TorrentClient.add_torrent().
+
+    Adding torrents faster than the backend can serve them splits its
+    bandwidth across all of them and delays every completion. A job is
+    admitted only when fewer than `max_active` admitted torrents are
+    running, the newest admission has had `warmup_seconds` to ramp up,
+    and the backend's global download rate divided among the active
+    torrents plus the new one stays at or above
+    `min_rate_per_torrent_bytes`. Admitted torrents whose telemetry
+    shows them stalled (no seeders, metadata still loading) do not
+    count towards that split, so they cannot hold back new adds. The
+    first torrent is always admitted. If the backend cannot report
+    stats only the active cap applies.
+
+    Call release() when a torrent completes or fails, for example from
+    WatchCallbacks.on_complete/on_error when using watch_many().
     """
 
     def __init__(
         self,
-        base_url: str,
-        username: str | None = None,
-        password: str | None = None,
+        client: TorrentClient,
+        max_active: int = 4,
+        min_rate_per_torrent_bytes: int = 100_000,
+        warmup_seconds: float = 30.0,
+        check_interval_seconds: float = 5.0,
     ):
-        super().__init__(base_url, username, password)
-        self.session = requests.Session()
-        self.request_id = 1
-
-        self.token = f"token:{password}" if password else None
+        self.client = client
+        self.max_active = max(1, max_active)
+        self.min_rate_per_torrent_bytes = min_rate_per_torrent_bytes
+        self.warmup_seconds = warmup_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._active: set[TorrentHandle] = set()
+        # Admissions whose add RPC is still in flight
+        self._adding = 0
+        self._last_admitted_at = -math.inf
+        self._condition = threading.Condition()
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active) + self._adding
+
+    def _has_slot(self) -> bool:
+        """Check the active cap and warm-up with the lock held."""
+        if self.active_count >= self.max_active:
+            return False
+        return (
+            self.active_count == 0
+            or time.monotonic() - self._last_admitted_at
+            >= self.warmup_seconds
+        )
 
-        print(f"[3/3] Connected to aria2 at: {self.base_url}")
+    def _has_bandwidth(
+        self, active: list[TorrentHandle], adding: int
+    ) -> bool:
+        """Check global throughput; called without the lock held."""
+        now = time.monotonic()
+        stalled = 0
+        for handle in active:
+            telemetry = self.client.telemetry.get(handle)
+            if telemetry and telemetry.is_stalled(now):
+                stalled += 1
+        producing = len(active) - stalled + adding
+        if producing == 0:
+            return True
+        try:
+            stats = self.client.get_transfer_stats()
+        except Exception as e:
+            print(f"  Warning: Failed to read transfer stats: {e}")
+            return True
 
-    def _execute_rpc(self, method: str, params: list) -> Any:
+        producing = max(producing, (stats.active_torrents or 0) - stalled)
+        per_torrent_rate = stats.download_rate_bytes_per_second / (
+            producing + 1
+        )
+        return per_torrent_rate >= self.min_rate_per_torrent_bytes
+
+    def _wait(self, deadline: Optional[float]) -> None:
+        """Wait for a release or the next check, with the lock held."""
+        wait_seconds = self.check_interval_seconds
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for admission")
+            wait_seconds = min(wait_seconds, remaining)
+        self._condition.wait(wait_seconds)
+
+    def admit(
+        self,
+        magnet_link: str,
+        timeout_seconds: float | None = None,
+        add: Optional[Callable[[str], TorrentHandle]] = None,
+    ) -> TorrentHandle:
         """
-        Execute an aria2 JSON-RPC 2.0 call.
+        Block until the backend has capacity, then add the torrent.
 
         Args:
-            method: RPC method name (e.g., "aria2.addUri")
-            params: List of method parameters
+            magnet_link: Magnet URI string
+            timeout_seconds: Maximum time to wait for admission
+            add: Function that adds the torrent (default:
+                client.add_torrent, e.g. WatchDirEnqueuer.add instead)
 
         Returns:
-            Result from RPC response
+            TorrentHandle for polling status
 
         Raises:
-            RuntimeError: If RPC call fails
+            TimeoutError: If not admitted within timeout_seconds
         """
-        if self.token:
-            params = [self.token] + params
+        deadline = (
+            None
+            if timeout_seconds is None
+            else time.monotonic() + timeout_seconds
+        )
+        # Stats and add RPCs run outside the lock so release() never
+        # waits behind the network
+        while True:
+            with self._condition:
+                while not self._has_slot():
+                    self._wait(deadline)
+                active = list(self._active)
+                adding = self._adding
+            has_bandwidth = self._has_bandwidth(active, adding)
+            with self._condition:
+                if has_bandwidth and self._has_slot():
+                    self._adding += 1
+                    self._last_admitted_at = time.monotonic()
+                    break
+                if not has_bandwidth:
+                    self._wait(deadline)
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": str(self.request_id),
-            "method": method,
-            "params": params,
-        }
-        self.request_id += 1
+        try:
+            with profile_stage("add"):
+                handle = (add or self.client.add_torrent)(magnet_link)
+        except BaseException:
+            with self._condition:
+                self._adding -= 1
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            self._adding -= 1
+            self._active.add(handle)
+        return handle
+
+    def release(self, handle: TorrentHandle, *_: Any) -> None:
+        """
+        Mark a torrent as finished so queued jobs can be admitted.
+        Extra arguments are ignored so it can be used as a callback.
+        """
+        with self._condition:
+            self._active.discard(handle)
+            self._condition.notify_all()
 
-        response = self.session.post(self.base_url, json=payload, timeout=15)
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"aria2 RPC failed: HTTP {response.status_code} "
-                f"response={response.text!r}"
+@dataclass
+class Job:
+    """A unit of work claimed from the JobQueue."""
+
+    job_id: int
+    query: str
+    exact_name: str
+    stage: str
+    magnet_link: Optional[str] = None
+    info_hash: Optional[str] = None
+    handle_id: Optional[str] = None
+    attempts: int = 0
+
+
+class JobQueue:
+    """
+    Shared search/add/wait job queue in a local SQLite database.
+
+    Several worker processes, on one host or on several hosts sharing
+    the database over a volume, coordinate through it without adding
+    the same magnet twice or polling the same handle twice:
+
+      - claim() atomically leases the oldest pending job, or a job
+        whose lease expired because its worker died
+      - renew() extends the lease while the worker is busy
+      - jobs record their stage (search -> add -> wait) plus magnet
+        and handle, so a reassigned job resumes instead of restarting
+      - reserve_add() lets exactly one job add a given info hash;
+        other jobs for the same torrent reuse its handle once the
+        backend confirms the torrent is still there
+
+    Multi-host use needs a filesystem with working POSIX byte-range
+    locks (e.g. NFSv4); the rollback journal is used rather than WAL
+    because WAL requires shared memory on a single host.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            query TEXT NOT NULL,
+            exact_name TEXT NOT NULL DEFAULT '',
+            state TEXT NOT NULL DEFAULT 'pending',
+            stage TEXT NOT NULL DEFAULT 'search',
+            magnet_link TEXT,
+            info_hash TEXT,
+            handle_id TEXT,
+            result TEXT,
+            worker_id TEXT,
+            lease_expires REAL NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL DEFAULT 0,
+            UNIQUE (query, exact_name)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_claimable
+            ON jobs (state, lease_expires);
+        CREATE TABLE IF NOT EXISTS torrents (
+            info_hash TEXT PRIMARY KEY,
+            job_id INTEGER NOT NULL,
+            handle_id TEXT
+        );
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = 120,
+        max_attempts: int = 3,
+    ):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=DELETE")
+            self._connection.executescript(self.SCHEMA)
+
+    def _transaction(
+        self, statements: Callable[[sqlite3.Connection], Any]
+    ) -> Any:
+        """Run statements inside BEGIN IMMEDIATE ... COMMIT."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._connection)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return result
+
+    def enqueue(self, query: str, exact_name: str = "") -> None:
+        """
+        Add a job unless an identical one is pending or running. A
+        finished (done or failed) identical job is reset and run again
+        from the search stage.
+        """
+        self._transaction(
+            lambda db: db.execute(
+                "INSERT INTO jobs (query, exact_name, updated_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (query, exact_name) DO UPDATE SET "
+                "state = 'pending', stage = 'search', magnet_link = NULL, "
+                "info_hash = NULL, handle_id = NULL, result = NULL, "
+                "worker_id = NULL, lease_expires = 0, attempts = 0, "
+                "updated_at = excluded.updated_at "
+                "WHERE state IN ('done', 'failed')",
+                (query, exact_name, time.time()),
             )
+        )
 
-        data = response.json()
-        if "error" in data:
-            raise RuntimeError(
-                f"aria2 RPC error: {data['error'].get('message', data['error'])}"
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Lease the next available job, or return None if idle."""
+
+        def statements(db: sqlite3.Connection) -> Optional[Job]:
+            now = time.time()
+            # Jobs whose worker died on the last allowed attempt are
+            # failed rather than handed out again
+            db.execute(
+                "UPDATE jobs SET state = 'failed', "
+                "result = 'lease expired after ' || attempts || "
+                "' attempts', updated_at = ? "
+                "WHERE state = 'claimed' AND lease_expires < ? "
+                "AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = db.execute(
+                "SELECT * FROM jobs WHERE state = 'pending' "
+                "OR (state = 'claimed' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = 'claimed', worker_id = ?, "
+                "lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            return Job(
+                job_id=row["id"],
+                query=row["query"],
+                exact_name=row["exact_name"],
+                stage=row["stage"],
+                magnet_link=row["magnet_link"],
+                info_hash=row["info_hash"],
+                handle_id=row["handle_id"],
+                attempts=row["attempts"] + 1,
             )
 
-        return data.get("result")
+        return self._transaction(statements)
+
+    def _update_owned(
+        self, job: Job, worker_id: str, assignments: str, params: tuple
+    ) -> bool:
+        """Update a job only while worker_id still holds its lease."""
+        cursor = self._transaction(
+            lambda db: db.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND state = 'claimed'",
+                params + (time.time(), job.job_id, worker_id),
+            )
+        )
+        return cursor.rowcount == 1
+
+    def renew(self, job: Job, worker_id: str) -> bool:
+        """Extend the lease; False means the job was reassigned."""
+        return self._update_owned(
+            job,
+            worker_id,
+            "lease_expires = ?",
+            (time.time() + self.lease_seconds,),
+        )
 
-    def add_magnet_link(self, magnet_link: str) -> TorrentHandle:
-        gid = self._execute_rpc("aria2.addUri", [[magnet_link]])
+    def advance(self, job: Job, worker_id: str, **fields: Any) -> bool:
+        """Persist stage/magnet_link/info_hash/handle_id for a job."""
+        allowed = ("stage", "magnet_link", "info_hash", "handle_id")
+        names = [name for name in fields if name in allowed]
+        for name in names:
+            setattr(job, name, fields[name])
+        return self._update_owned(
+            job,
+            worker_id,
+            ", ".join(f"{name} = ?" for name in names),
+            tuple(fields[name] for name in names),
+        )
 
-        if not gid:
-            raise RuntimeError("aria2 addUri returned no GID")
+    def complete(self, job: Job, worker_id: str, result: str) -> bool:
+        return self._update_owned(
+            job, worker_id, "state = 'done', result = ?", (result,)
+        )
 
-        print(f"  Successfully added magnet to aria2 (GID={gid})")
-        return TorrentHandle(handle_id=gid)
+    def fail(
+        self, job: Job, worker_id: str, error: str, retry: bool = True
+    ) -> bool:
+        """Return the job to the queue, or mark it failed for good."""
+        if retry and job.attempts < self.max_attempts:
+            return self._update_owned(
+                job,
+                worker_id,
+                "state = 'pending', result = ?, lease_expires = 0",
+                (error,),
+            )
+        return self._update_owned(
+            job, worker_id, "state = 'failed', result = ?", (error,)
+        )
 
-    def get_torrent_status(self, handle: TorrentHandle) -> TorrentStatus:
-        status_dict = self._execute_rpc(
-            "aria2.tellStatus",
-            [
-                handle.handle_id,
-                [
-                    "gid",
-                    "totalLength",
-                    "completedLength",
-                    "status",
-                    "dir",
-                    "bittorrent",
-                ],
-            ],
+    def reserve_add(self, job: Job, info_hash: str) -> bool:
+        """
+        Reserve the right to add info_hash. False means another job
+        (possibly from a dead worker) holds it; use find_handle().
+        """
+
+        def statements(db: sqlite3.Connection) -> bool:
+            db.execute(
+                "INSERT OR IGNORE INTO torrents (info_hash, job_id) "
+                "VALUES (?, ?)",
+                (info_hash, job.job_id),
+            )
+            row = db.execute(
+                "SELECT job_id FROM torrents WHERE info_hash = ?",
+                (info_hash,),
+            ).fetchone()
+            return row["job_id"] == job.job_id
+
+        return self._transaction(statements)
+
+    def record_handle(self, info_hash: str, handle_id: str) -> None:
+        self._transaction(
+            lambda db: db.execute(
+                "UPDATE torrents SET handle_id = ? WHERE info_hash = ?",
+                (handle_id, info_hash),
+            )
         )
 
-        if not status_dict:
-            return TorrentStatus()
+    def replace_add(self, job: Job, info_hash: str) -> None:
+        """
+        Take over the reservation for info_hash after the torrent it
+        recorded turned out to be gone from the backend.
+        """
+        self._transaction(
+            lambda db: db.execute(
+                "UPDATE torrents SET job_id = ?, handle_id = NULL "
+                "WHERE info_hash = ?",
+                (job.job_id, info_hash),
+            )
+        )
 
-        name = ""
-        bittorrent_info = status_dict.get("bittorrent", {})
-        if bittorrent_info and "info" in bittorrent_info:
-            name = bittorrent_info["info"].get("name", "")
+    def find_handle(self, info_hash: str) -> Optional[str]:
+        """Handle of a torrent already added by any worker."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT handle_id FROM torrents WHERE info_hash = ?",
+                (info_hash,),
+            ).fetchone()
+        return row["handle_id"] if row else None
 
-        total_size = int(status_dict.get("totalLength", 0) or 0)
-        downloaded = int(status_dict.get("completedLength", 0) or 0)
-        aria2_status = status_dict.get("status", "")
-        is_complete = aria2_status == "complete"
-        directory = status_dict.get("dir", "") or ""
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
 
-        return TorrentStatus(
-            name=name,
-            total_size_bytes=total_size,
-            downloaded_bytes=downloaded,
-            is_complete=is_complete,
-            download_directory=directory,
-        )
 
+class _LeaseLost(Exception):
+    """The job's lease expired and another worker may own it now."""
 
-def create_torrent_client(
-    client_type: str, url: str, username: str | None, password: str | None
-) -> TorrentClient:
+
+class _LeaseKeeper:
+    """Renews a job lease on a background thread while work runs."""
+
+    def __init__(self, job_queue: JobQueue, job: Job, worker_id: str):
+        self._stop_event = threading.Event()
+        self.lost = False
+
+        def renew_loop() -> None:
+            while not self._stop_event.wait(job_queue.lease_seconds / 3):
+                try:
+                    if not job_queue.renew(job, worker_id):
+                        self.lost = True
+                        return
+                except sqlite3.Error as e:
+                    print(f"\n  Warning: Lease renewal failed: {e}")
+
+        self._thread = threading.Thread(
+            target=renew_loop, name="lease", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+
+def run_queue_worker(
+    job_queue: JobQueue,
+    client: TorrentClient,
+    worker_id: str,
+    search_frontend: ApibaySearch | None = None,
+    poll_interval_seconds: int = 10,
+    timeout_seconds: int = 3600,
+    admission: AdmissionController | None = None,
+    retention: RetentionEngine | None = None,
+    watch_dir: WatchDirEnqueuer | None = None,
+) -> int:
     """
-    Factory function to create the appropriate torrent client.
+    Claim and process jobs until none are available.
+
+    Search and add stages run on job threads. Once a job's torrent is
+    added, its handle is passed to a single watch_many() loop that
+    polls every waiting job's torrent in batched status calls. Without
+    `admission` one job runs at a time. With it, up to
+    admission.max_active jobs run concurrently and each add waits for
+    the controller to admit it. With `watch_dir`, adds go through the
+    watch directory, and adds of concurrently running jobs share one
+    write-and-resolve pass. Completed torrents are passed to
+    `retention` as handed off.
 
-    Args:
-        client_type: Client identifier (rtorrent, qbittorrent, etc.)
-        url: Backend URL
-        username: Optional username
-        password: Optional password/token
+    Returns:
+        Number of jobs this worker failed
+    """
+    max_concurrent = admission.max_active if admission else 1
+    slots = threading.Semaphore(max_concurrent)
+    condition = threading.Condition()
+    in_progress = 0
+    finished = 0
+    failures = 0
+    waiting: dict[TorrentHandle, list[tuple[Job, _LeaseKeeper]]] = {}
+    watch_queue: "queue.Queue[Optional[TorrentHandle]]" = queue.Queue()
+
+    def finish(
+        lease: _LeaseKeeper,
+        handle: Optional[TorrentHandle],
+        succeeded: bool,
+    ) -> None:
+        nonlocal in_progress, finished, failures
+        lease.stop()
+        if admission and handle:
+            admission.release(handle)
+        slots.release()
+        with condition:
+            in_progress -= 1
+            finished += 1
+            failures += 0 if succeeded else 1
+            condition.notify_all()
+
+    def run_job(job: Job) -> None:
+        lease = _LeaseKeeper(job_queue, job, worker_id)
+        try:
+            handle = _process_job(
+                job_queue,
+                client,
+                worker_id,
+                job,
+                lease,
+                search_frontend,
+                timeout_seconds,
+                admission,
+                watch_dir,
+            )
+        except Exception as e:
+            # Recording the failure itself failed (e.g. database locked)
+            print(f"\n  Error processing job {job.job_id}: {e}")
+            handle = None
+        except _LeaseLost:
+            print(f"\n  Warning: Lease on job {job.job_id} was lost")
+            finish(lease, None, True)
+            return
+        if handle is None:
+            finish(lease, None, False)
+            return
+        with condition:
+            waiting.setdefault(handle, []).append((job, lease))
+        watch_queue.put(handle)
+
+    def take(handle: TorrentHandle) -> list[tuple[Job, _LeaseKeeper]]:
+        with condition:
+            return waiting.pop(handle, [])
+
+    def on_progress(handle: TorrentHandle, status: TorrentStatus) -> bool:
+        # Drop jobs whose lease moved to another worker; that worker
+        # watches the torrent from now on
+        with condition:
+            jobs = waiting.pop(handle, [])
+            kept = [(job, lease) for job, lease in jobs if not lease.lost]
+            if kept:
+                waiting[handle] = kept
+        for job, lease in jobs:
+            if lease.lost:
+                print(f"\n  Warning: Lease on job {job.job_id} was lost")
+                finish(lease, handle, True)
+        return bool(kept)
+
+    def on_complete(handle: TorrentHandle, status: TorrentStatus) -> None:
+        for job, lease in take(handle):
+            if lease.lost:
+                print(f"\n  Warning: Lease on job {job.job_id} was lost")
+                finish(lease, handle, True)
+                continue
+            print(f"\n[job {job.job_id}] Download complete: {status.name}")
+            if retention:
+                retention.mark_handed_off(handle)
+            try:
+                job_queue.complete(
+                    job, worker_id, str(status.download_path())
+                )
+            except sqlite3.Error as e:
+                print(f"\n  Warning: Failed to record job {job.job_id}: {e}")
+            finish(lease, handle, True)
+
+    def on_error(handle: TorrentHandle, error: Exception) -> None:
+        for job, lease in take(handle):
+            print(f"\n  Error processing job {job.job_id}: {error}")
+            try:
+                job_queue.fail(job, worker_id, str(error))
+            except sqlite3.Error as e:
+                print(f"\n  Warning: Failed to record job {job.job_id}: {e}")
+            finish(lease, handle, False)
+
+    watcher = threading.Thread(
+        target=profile_thread(watch_many),
+        args=(client, []),
+        kwargs={
+            "callbacks": WatchCallbacks(
+                on_complete=on_complete,
+                on_progress=on_progress,
+                on_error=on_error,
+            ),
+            "poll_interval_seconds": poll_interval_seconds,
+            "timeout_seconds": timeout_seconds,
+            "incoming": watch_queue,
+        },
+        name="job-watch",
+        daemon=True,
+    )
+    watcher.start()
+
+    with ThreadPoolExecutor(
+        max_workers=max_concurrent, thread_name_prefix="job"
+    ) as executor:
+        while True:
+            slots.acquire()
+            with condition:
+                seen = finished
+            job = job_queue.claim(worker_id)
+            if job is not None:
+                with condition:
+                    in_progress += 1
+                executor.submit(profile_thread(run_job), job)
+                continue
+
+            slots.release()
+            with condition:
+                if in_progress == 0:
+                    break
+                # Jobs may still be enqueued by others; look again once
+                # a running job finishes
+                while finished == seen:
+                    condition.wait()
+
+    watch_queue.put(None)
+    watcher.join()
+    return failures
+
+
+def _process_job(
+    job_queue: JobQueue,
+    client: TorrentClient,
+    worker_id: str,
+    job: Job,
+    lease: _LeaseKeeper,
+    search_frontend: ApibaySearch | None,
+    timeout_seconds: int,
+    admission: AdmissionController | None,
+    watch_dir: WatchDirEnqueuer | None = None,
+) -> Optional[TorrentHandle]:
+    """
+    Run one claimed job through its search and add stages.
 
     Returns:
-        Initialized TorrentClient instance
+        Handle of the job's torrent to wait on, or None if the job
+        failed
 
     Raises:
-        RuntimeError: If client_type is unsupported
+        _LeaseLost: If the job was reassigned to another worker
     """
-    client_type_lower = client_type.strip().lower()
+    print(f"\n[job {job.job_id}] {job.query} / {job.exact_name}")
+    handle_id: Optional[str] = None
 
-    client_map = {
-        "rtorrent": RTorrentClient,
-        "rutorrent": RTorrentClient,
-        "qbittorrent": QBittorrentClient,
-        "qbit": QBittorrentClient,
-        "qbt": QBittorrentClient,
-        "transmission": TransmissionClient,
-        "trans": TransmissionClient,
-        "deluge": DelugeClient,
-        "aria2": Aria2Client,
-        "aria2c": Aria2Client,
-    }
+    def advance(**fields: Any) -> None:
+        if lease.lost or not job_queue.advance(job, worker_id, **fields):
+            raise _LeaseLost()
 
-    client_class = client_map.get(client_type_lower)
-    if not client_class:
-        supported = ", ".join(
-            sorted(set(client_map.values().__name__ for _ in client_map))
-        )
-        raise RuntimeError(
-            f"Unsupported TORRENT_CLIENT='{client_type}'. "
-            f"Supported: {supported}"
+    try:
+        if job.stage == "wait" and job.info_hash:
+            # Resumed from a dead worker: the recorded handle may be
+            # stale (torrent removed, Transmission ids renumbered after
+            # a restart), so look the torrent up again
+            resolved = client.resolve_handles([job.info_hash])
+            if job.info_hash in resolved:
+                advance(handle_id=resolved[job.info_hash].handle_id)
+            else:
+                advance(stage="add", handle_id=None)
+
+        if job.stage == "search":
+            magnet_link = search_magnet_link(
+                job.query, job.exact_name or None, search_frontend
+            )
+            if not magnet_link:
+                job_queue.fail(
+                    job, worker_id, "No magnet link found", retry=False
+                )
+                return None
+            info_hash = (
+                extract_info_hash_from_magnet(magnet_link) or ""
+            ).lower()
+            advance(
+                stage="add",
+                magnet_link=magnet_link,
+                info_hash=info_hash,
+            )
+
+        if job.stage == "add":
+            handle_id = _add_once(
+                job_queue, client, job, admission, timeout_seconds, watch_dir
+            )
+            advance(stage="wait", handle_id=handle_id)
+
+        return TorrentHandle(handle_id=job.handle_id)
+
+    except _LeaseLost:
+        if admission and handle_id:
+            admission.release(TorrentHandle(handle_id=handle_id))
+        raise
+    except Exception as e:
+        print(f"\n  Error processing job {job.job_id}: {e}")
+        job_queue.fail(job, worker_id, str(e))
+        if admission and handle_id:
+            admission.release(TorrentHandle(handle_id=handle_id))
+        return None
+
+
+def _add_once(
+    job_queue: JobQueue,
+    client: TorrentClient,
+    job: Job,
+    admission: AdmissionController | None = None,
+    admission_timeout_seconds: float | None = None,
+    watch_dir: WatchDirEnqueuer | None = None,
+    wait_seconds: float = 60,
+) -> str:
+    """Add a job's torrent unless another job already added it."""
+    info_hash = job.info_hash or ""
+    if info_hash and not job_queue.reserve_add(job, info_hash):
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if job_queue.find_handle(info_hash):
+                break
+            time.sleep(1)
+        # Trust the backend rather than the recorded handle: the torrent
+        # may have been removed since, Transmission renumbers ids after
+        # a restart, and a dead worker may have added it without
+        # recording a handle (aria2 and Deluge reject a duplicate add)
+        resolved = client.resolve_handles([info_hash])
+        if info_hash in resolved:
+            handle_id = resolved[info_hash].handle_id
+            if job_queue.find_handle(info_hash) != handle_id:
+                job_queue.record_handle(info_hash, handle_id)
+            print(f"  Reusing handle added by another job: {handle_id}")
+            return handle_id
+        job_queue.replace_add(job, info_hash)
+
+    add = watch_dir.add if watch_dir else client.add_torrent
+    if admission:
+        handle = admission.admit(
+            job.magnet_link or "", admission_timeout_seconds, add
         )
+    else:
+        with profile_stage("add"):
+            handle = add(job.magnet_link or "")
+    if info_hash:
+        job_queue.record_handle(info_hash, handle.handle_id)
+    return handle.handle_id
 
-    return client_class(base_url=url, username=username, password=password)
+
+def _run_retention(retention: RetentionEngine) -> None:
+    """Apply the retention policy once and report the result."""
+    try:
+        removed = retention.run_once()
+        print(f"  Retention: removed {removed} finished torrent(s)")
+    except Exception as e:
+        print(f"  Warning: Retention failed: {e}")
 
 
 def main() -> None:
@@ -927,8 +5194,12 @@ def main() -> None:
         description="Search torrents and download via multiple client backends",
         epilog="Supported clients: rTorrent, qBittorrent, Transmission, Deluge, aria2",
     )
-    parser.add_argument("query", help="Search query for ThePirateBay")
-    parser.add_argument("exact_name", help="Exact torrent name to match")
+    parser.add_argument(
+        "query", nargs="?", help="Search query for ThePirateBay"
+    )
+    parser.add_argument(
+        "exact_name", nargs="?", help="Exact torrent name to match"
+    )
     parser.add_argument(
         "--torrent-url",
         default=os.getenv(
@@ -959,31 +5230,334 @@ def main() -> None:
         default=3600,
         help="Download timeout in seconds (default: 3600)",
     )
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv("TORRENT_METRICS_FILE", ""),
+        help="Write per-torrent rate, ETA and stall flag here as JSON "
+        "while downloading (default: disabled)",
+    )
+    parser.add_argument(
+        "--metainfo-cache",
+        default=os.getenv("METAINFO_CACHE_DIR", ""),
+        help="Directory for cached .torrent files keyed by info hash "
+        "(default: disabled)",
+    )
+    parser.add_argument(
+        "--select-files",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Only download files matching this glob, e.g. '*.pdf' "
+        "(repeatable; default: all files)",
+    )
+    parser.add_argument(
+        "--apibay-rate",
+        type=float,
+        default=1.0,
+        help="Maximum apibay requests per second (default: 1.0)",
+    )
+    parser.add_argument(
+        "--apibay-burst",
+        type=int,
+        default=5,
+        help="apibay requests allowed in a burst (default: 5)",
+    )
+    parser.add_argument(
+        "--search-index",
+        default=os.getenv("WSJ_SEARCH_INDEX", ""),
+        help="SQLite index of every search result seen; exact names "
+        "found there skip the apibay search (default: WSJ_SEARCH_INDEX "
+        "or disabled)",
+    )
+    parser.add_argument(
+        "--watch-dir",
+        default=os.getenv("TORRENT_WATCH_DIR", ""),
+        help="Enqueue through this backend watch directory instead of RPC "
+        "(rTorrent and Transmission only)",
+    )
+    parser.add_argument(
+        "--downloads-dir",
+        default=os.getenv("TORRENT_DOWNLOADS_DIR", ""),
+        help="Local path of the backend's download directory; detects "
+        "completion from inotify events instead of frequent polling",
+    )
+    parser.add_argument(
+        "--heartbeat-interval",
+        type=int,
+        default=120,
+        help="Status check interval between inotify events in seconds "
+        "(default: 120)",
+    )
+    parser.add_argument(
+        "--deluge-events",
+        action="store_true",
+        help="Deluge only: detect completion from web.get_events instead "
+        "of polling; status is still checked every --heartbeat-interval",
+    )
+    parser.add_argument(
+        "--max-active",
+        type=int,
+        default=0,
+        help="Queue mode: run up to N jobs at once, admitting each add "
+        "only while fewer than N are downloading and bandwidth allows "
+        "(default: one job at a time, no admission control)",
+    )
+    parser.add_argument(
+        "--min-rate-per-torrent",
+        type=int,
+        default=100_000,
+        help="With --max-active, hold new adds until the backend's "
+        "download rate shared with the new torrent is at least this many "
+        "bytes/s (default: 100000)",
+    )
+    parser.add_argument(
+        "--remove-after-handoff",
+        action="store_true",
+        help="Remove the torrent from the backend once downloaded "
+        "(data is kept)",
+    )
+    parser.add_argument(
+        "--seed-ratio",
+        type=float,
+        help="Remove every finished torrent on the backend, including "
+        "ones this tool did not add, once it reaches this ratio",
+    )
+    parser.add_argument(
+        "--seed-time",
+        type=int,
+        help="Remove every finished torrent on the backend, including "
+        "ones this tool did not add, this many seconds after completion "
+        "(not supported by aria2)",
+    )
+    parser.add_argument(
+        "--keep-max",
+        type=int,
+        help="Keep at most this many finished torrents on the backend, "
+        "counting and removing ones this tool did not add (not supported "
+        "by aria2)",
+    )
+    parser.add_argument(
+        "--retention-interval",
+        type=float,
+        default=600,
+        help="With --queue, apply the retention options every this many "
+        "seconds while working the queue (default: 600)",
+    )
+    parser.add_argument(
+        "--queue",
+        default=os.getenv("WSJ_QUEUE", ""),
+        help="Shared SQLite job queue; enqueue the query (if given) and "
+        "work the queue with other workers",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=f"{socket.gethostname()}:{os.getpid()}",
+        help="Worker name recorded on claimed jobs (default: host:pid)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage wall/CPU time and per-method RPC counts",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PSTATS",
+        help="With --profile, also write a cProfile/pstats dump covering "
+        "the main thread, the startup threads and queue job threads",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="Record all HTTP/XML-RPC traffic with timings to a cassette",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="Replay traffic from a cassette instead of the network",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Latency multiplier for --replay; 0 replays instantly "
+        "(default: 1.0)",
+    )
 
     args = parser.parse_args()
+    if not args.query and not args.queue:
+        parser.error("query is required unless --queue is given")
+    if args.queue:
+        single_run_only = {
+            "--downloads-dir": args.downloads_dir,
+            "--deluge-events": args.deluge_events,
+        }
+        unsupported = [
+            flag for flag, given in single_run_only.items() if given
+        ]
+        if unsupported:
+            parser.error(
+                f"{', '.join(unsupported)} cannot be used with --queue"
+            )
+
+    if args.deluge_events and args.downloads_dir:
+        parser.error(
+            "--deluge-events and --downloads-dir are mutually exclusive"
+        )
+
+    cassette: Optional[Cassette] = None
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay", args.replay_speed)
+    if cassette:
+        cassette.install()
+    profiler: Optional[StageProfiler] = None
+    if args.profile:
+        profiler = StageProfiler(code_profile=bool(args.profile_output))
+        profiler.install()
+    completion_source: (
+        InotifyCompletionSource | DelugeCompletionWaiter | None
+    ) = None
+    event_stream: Optional[DelugeEventStream] = None
+
+    retention_policy = RetentionPolicy(
+        remove_after_handoff=args.remove_after_handoff,
+        max_seed_ratio=args.seed_ratio,
+        max_seed_seconds=args.seed_time,
+        keep_at_most=args.keep_max,
+    )
+    retention: Optional[RetentionEngine] = None
 
+    startup_executor = ThreadPoolExecutor(
+        max_workers=3, thread_name_prefix="startup"
+    )
     try:
-        # Step 1-2: Search for magnet link
-        magnet_link = search_magnet_link(args.query, args.exact_name)
-        if not magnet_link:
-            print("\nError: No magnet link found")
-            sys.exit(1)
+        # Steps 1-3 are independent round trips, so run them together:
+        # the tracker fetch is shared with the search through the
+        # front end's coalescing, and a failed fetch still degrades to
+        # no trackers
+        search_frontend = ApibaySearch(
+            TokenBucket(args.apibay_rate, capacity=args.apibay_burst),
+            search_index=(
+                SearchIndex(args.search_index) if args.search_index else None
+            ),
+        )
 
-        # Step 3: Initialize client
-        client_type = os.getenv("TORRENT_CLIENT", "rtorrent")
-        client = create_torrent_client(
-            client_type=client_type,
+        if args.queue:
+            job_queue = JobQueue(args.queue)
+            if args.query:
+                job_queue.enqueue(args.query, args.exact_name or "")
+            client = create_torrent_client(
+                client_type=os.getenv("TORRENT_CLIENT", "rtorrent"),
+                url=args.torrent_url,
+                username=args.torrent_user,
+                password=args.torrent_password,
+            )
+            if args.metainfo_cache:
+                client.metainfo_cache = MetainfoCache(args.metainfo_cache)
+            if args.select_files:
+                client.file_selection = FileSelection(args.select_files)
+            if args.metrics_file:
+                client.telemetry.metrics_path = Path(args.metrics_file)
+            if retention_policy.enabled:
+                # Thousands of finished jobs pile up in a batch run, so
+                # prune alongside the workers rather than at the end
+                retention = RetentionEngine(client, retention_policy)
+                retention.start(args.retention_interval)
+            failures = run_queue_worker(
+                job_queue,
+                client,
+                args.worker_id,
+                search_frontend,
+                poll_interval_seconds=args.poll_interval,
+                timeout_seconds=args.timeout,
+                admission=(
+                    AdmissionController(
+                        client,
+                        max_active=args.max_active,
+                        min_rate_per_torrent_bytes=args.min_rate_per_torrent,
+                        # Watch directory adds are written in batches;
+                        # spacing them out would leave one per batch
+                        warmup_seconds=0 if args.watch_dir else 30,
+                    )
+                    if args.max_active > 0
+                    else None
+                ),
+                retention=retention,
+                watch_dir=(
+                    WatchDirEnqueuer(client, args.watch_dir)
+                    if args.watch_dir
+                    else None
+                ),
+            )
+            print(f"\nQueue drained ({failures} failed job(s))")
+            if retention:
+                retention.stop()
+                _run_retention(retention)
+            sys.exit(1 if failures else 0)
+
+        startup_executor.submit(profile_thread(search_frontend.tracker_string))
+        search_future = startup_executor.submit(
+            profile_thread(search_magnet_link),
+            args.query,
+            args.exact_name,
+            search_frontend,
+        )
+        client_future = startup_executor.submit(
+            profile_thread(create_torrent_client),
+            client_type=os.getenv("TORRENT_CLIENT", "rtorrent"),
             url=args.torrent_url,
             username=args.torrent_user,
             password=args.torrent_password,
         )
 
+        magnet_link = search_future.result()
+        if not magnet_link:
+            print("\nError: No magnet link found")
+            sys.exit(1)
+
+        client = client_future.result()
+        startup_executor.shutdown(wait=False)
+        if args.metainfo_cache:
+            client.metainfo_cache = MetainfoCache(args.metainfo_cache)
+        if args.select_files:
+            client.file_selection = FileSelection(args.select_files)
+        if args.metrics_file:
+            client.telemetry.metrics_path = Path(args.metrics_file)
+        if retention_policy.enabled:
+            retention = RetentionEngine(client, retention_policy)
+
         # Add magnet and wait for completion
-        torrent_handle = client.add_magnet_link(magnet_link)
+        if args.watch_dir:
+            with profile_stage("add"):
+                enqueuer = WatchDirEnqueuer(client, args.watch_dir)
+                handles = enqueuer.enqueue_many([magnet_link])
+            if not handles:
+                print("\nError: Torrent was not loaded from watch directory")
+                sys.exit(1)
+            torrent_handle = next(iter(handles.values()))
+        else:
+            with profile_stage("add"):
+                torrent_handle = client.add_torrent(magnet_link)
+        if args.downloads_dir:
+            completion_source = InotifyCompletionSource.create(
+                args.downloads_dir
+            )
+        elif args.deluge_events and isinstance(client, DelugeClient):
+            event_stream = DelugeEventStream(
+                client, fallback_interval_seconds=args.poll_interval
+            )
+            completion_source = event_stream.watch(torrent_handle)
+        elif args.deluge_events:
+            print("  Warning: --deluge-events needs Deluge, polling instead")
         download_path = client.wait_until_complete(
             torrent_handle,
             poll_interval_seconds=args.poll_interval,
             timeout_seconds=args.timeout,
+            completion_source=completion_source,
+            heartbeat_seconds=args.heartbeat_interval,
         )
 
         if not download_path:
@@ -991,6 +5565,10 @@ def main() -> None:
             sys.exit(1)
 
         print(f"\n\nSuccess! Downloaded to: {download_path}")
+
+        if retention:
+            retention.mark_handed_off(torrent_handle)
+            _run_retention(retention)
         sys.exit(0)
 
     except KeyboardInterrupt:
@@ -999,6 +5577,19 @@ def main() -> None:
     except Exception as e:
         print(f"\nError: {e}")
         sys.exit(1)
+    finally:
+        startup_executor.shutdown(wait=False, cancel_futures=True)
+        if completion_source:
+            completion_source.close()
+        if event_stream:
+            event_stream.close()
+        if profiler:
+            profiler.uninstall()
+            if args.profile_output:
+                profiler.dump_code_profile(args.profile_output)
+            print("\n" + profiler.summary())
+        if cassette:
+            cassette.uninstall()
 
 
 if __name__ == "__main__":